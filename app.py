@@ -1,36 +1,75 @@
-from flask import Flask, render_template, request, jsonify, send_file, flash, redirect, url_for
+from flask import (Flask, render_template, request, jsonify, send_file, flash, redirect, url_for, Response,
+                   abort, stream_with_context)
 import json
-from datetime import datetime
-from database import init_db, save_query, get_all_queries
-from pdf_generator import generate_case_pdf
+from datetime import date
+from database import (init_db, init_app, save_query, get_query, search_queries,
+                      DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE)
+from pdf_generator import case_pdf, cached_pdf_path, pdf_cache_key
 from scraper import scrape_case_by_number, create_sample_data
-import os
+from cause_list_store import ensure_cause_list_store, count_listings, get_listings
+from lookup_cache import LookupCache
+from jobs import JobWorkerPool, get_job, FINISHED_STATUSES
+from court_metadata import get_options
+import io
+import time
 
 app = Flask(__name__)
 app.secret_key = 'your-secret-key-change-this'
 
+# Most listings shown on the index page
+INDEX_LISTING_LIMIT = 500
+
+# Page sizes offered on the search history page
+PAGE_SIZE_CHOICES = (10, 25, 50, 100)
+
+# Query string filters accepted by the search history page
+HISTORY_FILTERS = ('case_type', 'case_number', 'year', 'party', 'start_date', 'end_date')
+
+# Optional search form fields naming the High Court bench to look the case up
+# on (resolved to portal codes through the court metadata store); without
+# them the search returns sample data
+COURT_FIELDS = ('state', 'bench', 'case_type')
+
+# How often the job event stream checks a running search
+JOB_EVENT_INTERVAL = 0.5
+
 # Initialize database on startup
 init_db()
+ensure_cause_list_store()
+init_app(app)
+
+# Repeat searches for a case are answered from cache while it is fresh
+case_lookup_cache = LookupCache(scrape_case_by_number)
+
+def run_search_job(case_type, case_number, year, court=None):
+    """Background search: look the case up and save it, returning the query id"""
+    case_data = case_lookup_cache.get(case_type, case_number, year, court)
+    if not case_data:
+        raise LookupError('Case not found or unavailable')
+    return {'query_id': save_query(case_type, case_number, year, case_data)}
+
+# Searches run on worker threads so a slow portal doesn't tie up request handlers
+job_workers = JobWorkerPool({'search': run_search_job})
+job_workers.start()
 
 @app.route('/')
 def index():
     """Main page with search form and cause list display"""
     try:
-        # Load sample cause list data
-        if os.path.exists('cause_list.json'):
-            with open('cause_list.json', 'r') as f:
-                cause_list = json.load(f)
+        # Upcoming listings from the indexed store; sample data until a scrape has run
+        if count_listings():
+            cause_list = get_listings(start_date=date.today().isoformat(), limit=INDEX_LISTING_LIMIT)
         else:
             cause_list = create_sample_data()
         
-        return render_template('index.html', cause_list=cause_list)
+        return render_template('index.html', cause_list=cause_list, high_courts=get_options('state'))
     except Exception as e:
         flash(f'Error loading cause list: {str(e)}', 'error')
-        return render_template('index.html', cause_list=[])
+        return render_template('index.html', cause_list=[], high_courts=[])
 
 @app.route('/search', methods=['POST'])
 def search_case():
-    """Handle case search form submission"""
+    """Queue a case search and send the user to its job page"""
     try:
         case_type = request.form.get('case_type')
         case_number = request.form.get('case_number')
@@ -45,35 +84,106 @@ def search_case():
             flash('Year must be a 4-digit number', 'error')
             return redirect(url_for('index'))
         
-        # Search for case using scraper
-        case_data = scrape_case_by_number(case_type, case_number, year)
-        
-        if not case_data:
-            flash('Case not found or unavailable', 'warning')
+        court = {field: request.form.get(f'court_{field}', '').strip() for field in COURT_FIELDS}
+        if any(court.values()) and not all(court.values()):
+            flash('Give the High Court, bench and portal case type together, or none of them', 'error')
             return redirect(url_for('index'))
         
-        # Save query to database
-        query_id = save_query(case_type, case_number, year, case_data)
+        # The scrape runs on a job worker; the job page waits for it
+        job_id = job_workers.submit('search', {
+            'case_type': case_type, 'case_number': case_number, 'year': year,
+            'court': court if all(court.values()) else None})
         
-        return render_template('results.html', case_data=case_data, query_id=query_id)
+        return redirect(url_for('view_job', job_id=job_id))
         
     except Exception as e:
         flash(f'Search error: {str(e)}', 'error')
         return redirect(url_for('index'))
 
+def job_status(job):
+    """Public view of a job for the status endpoints"""
+    status = {'id': job['id'], 'status': job['status'], 'error': job['error']}
+    if job['status'] == 'done':
+        status['results_url'] = url_for('view_results', query_id=job['result']['query_id'])
+    return status
+
+@app.route('/jobs/<int:job_id>')
+def view_job(job_id):
+    """Wait page for a queued search; goes to the results once the job is done"""
+    job = get_job(job_id)
+    if not job:
+        abort(404)
+    if job['status'] == 'done':
+        return redirect(url_for('view_results', query_id=job['result']['query_id']))
+    return render_template('job.html', job=job)
+
+@app.route('/jobs/<int:job_id>/status')
+def job_status_json(job_id):
+    """Job status as JSON, for polling"""
+    job = get_job(job_id)
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job_status(job))
+
+@app.route('/jobs/<int:job_id>/events')
+def job_events(job_id):
+    """Server-Sent Events stream that reports the job's status until it finishes"""
+    if not get_job(job_id):
+        abort(404)
+
+    # Keep the request context (for url_for in job_status) while the stream runs;
+    # its teardown releases the database connection when the stream ends
+    @stream_with_context
+    def stream():
+        last_status = None
+        while True:
+            job = get_job(job_id)
+            if job['status'] != last_status:
+                last_status = job['status']
+                yield f"data: {json.dumps(job_status(job))}\n\n"
+            if job['status'] in FINISHED_STATUSES:
+                return
+            time.sleep(JOB_EVENT_INTERVAL)
+
+    return Response(stream(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/results/<int:query_id>')
+def view_results(query_id):
+    """Show a saved search result"""
+    query = get_query(query_id)
+    if not query:
+        abort(404)
+    return render_template('results.html', case_data=query['response_data'], query_id=query_id)
+
 @app.route('/download_pdf/<int:query_id>')
 def download_pdf(query_id):
-    """Generate and download PDF for a specific query"""
+    """Download the PDF for a specific query, rendering it only on the first request"""
     try:
-        queries = get_all_queries()
-        query = next((q for q in queries if q['id'] == query_id), None)
+        query = get_query(query_id)
         
         if not query:
             flash('Query not found', 'error')
             return redirect(url_for('index'))
         
-        pdf_path = generate_case_pdf(query)
-        return send_file(pdf_path, as_attachment=True, download_name=f'case_{query_id}.pdf')
+        # Saved queries never change, so the cache key doubles as a strong ETag;
+        # a client that has this version gets a 304 before any file is read
+        cache_key = pdf_cache_key(query)
+        if cache_key in request.if_none_match:
+            response = Response(status=304)
+            response.set_etag(cache_key)
+            return response
+        
+        download = dict(mimetype='application/pdf', as_attachment=True,
+                        download_name=f'case_{query_id}.pdf', etag=cache_key, conditional=True)
+        pdf_path = cached_pdf_path(cache_key)
+        if pdf_path:
+            try:
+                return send_file(pdf_path, **download)
+            except FileNotFoundError:
+                pass  # evicted since the check; render it again below
+        pdf_data, _ = case_pdf(query, key=cache_key)
+        return send_file(io.BytesIO(pdf_data), **download)
         
     except Exception as e:
         flash(f'PDF generation error: {str(e)}', 'error')
@@ -81,13 +191,20 @@ def download_pdf(query_id):
 
 @app.route('/queries')
 def view_queries():
-    """View all saved queries"""
+    """View saved queries a page at a time, newest first, optionally filtered"""
+    limit = request.args.get('limit', DEFAULT_PAGE_SIZE, type=int)
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    before = request.args.get('before')
+    filters = {name: request.args[name].strip() for name in HISTORY_FILTERS
+               if request.args.get(name, '').strip()}
     try:
-        queries = get_all_queries()
-        return render_template('queries.html', queries=queries)
+        queries, next_cursor = search_queries(limit=limit, before=before, **filters)
     except Exception as e:
         flash(f'Error loading queries: {str(e)}', 'error')
-        return render_template('queries.html', queries=[])
+        queries, next_cursor = [], None
+    return render_template('queries.html', queries=queries, next_cursor=next_cursor,
+                           limit=limit, is_first_page=not before, filters=filters,
+                           page_sizes=PAGE_SIZE_CHOICES)
 
 if __name__ == '__main__':
     app.run(debug=True)
\ No newline at end of file
@@ -1,30 +1,95 @@
-import json
+import argparse
 from datetime import datetime, timedelta
+from cause_list_store import ensure_cause_list_store, count_listings, find_listings, iter_listings
+from case_number import normalize_case_number
 
 def check_case():
     """Check if a case is listed for tomorrow"""
-    # Read JSON data
-    try:
-        with open('cause_list.json', 'r', encoding='utf-8') as f:
-            cases = json.load(f)
-    except FileNotFoundError:
-        print("cause_list.json not found")
+    # Open the indexed cause list store (imports cause_list.json on first use)
+    ensure_cause_list_store()
+    if count_listings() == 0:
+        print("No cause list data found - run scraper.py first")
         return
     
     # Get user input
     case_number = input("Enter case number: ").strip()
     
     # Get tomorrow's date
-    tomorrow = (datetime.now() + timedelta(days=1)).strftime('%d-%m-%Y')
+    tomorrow = (datetime.now() + timedelta(days=1)).strftime('%Y-%m-%d')
     
-    # Check if case is listed tomorrow
-    for case in cases:
-        if (case.get('case_number', '').strip().lower() == case_number.lower() and 
-            tomorrow in case.get('date_of_listing', '')):
-            print("✅ Your case is listed tomorrow.")
-            return
+    # Check if case is listed tomorrow (indexed lookup on the normalized case number)
+    if find_listings(case_number, tomorrow):
+        print("✅ Your case is listed tomorrow.")
+        return
     
     print("❌ Your case is NOT listed tomorrow.")
 
+def load_case_numbers(filename):
+    """Read case numbers from a text file, one per line ('#' starts a comment)"""
+    with open(filename, 'r', encoding='utf-8') as f:
+        return [line.split('#')[0].strip() for line in f if line.split('#')[0].strip()]
+
+def check_cases(case_numbers, start_date=None, end_date=None):
+    """Check many case numbers against the cause list in a single pass
+
+    Dates are datetime.date objects or ISO strings and default to tomorrow.
+    Returns a dict mapping each case number as given to its listings in the range.
+    """
+    tomorrow = (datetime.now() + timedelta(days=1)).strftime('%Y-%m-%d')
+    start_date = str(start_date or tomorrow)
+    end_date = str(end_date or start_date)
+
+    # Build the normalized lookup set once, then scan the listings once; a case
+    # number given twice is looked up, and reported, once
+    wanted = {}
+    for case_number in case_numbers:
+        wanted.setdefault(normalize_case_number(case_number), set()).add(case_number)
+
+    hits = {case_number: [] for case_number in case_numbers}
+    for listing in iter_listings(start_date, end_date):
+        for case_number in wanted.get(listing.pop('case_number_norm'), ()):
+            hits[case_number].append(listing)
+    return hits
+
+def parse_date(text):
+    """ISO date from a dd-mm-yyyy command line argument"""
+    return datetime.strptime(text, '%d-%m-%Y').strftime('%Y-%m-%d')
+
+def batch_check(case_numbers, start_date=None, end_date=None):
+    """Print which of many cases are listed in a date range"""
+    ensure_cause_list_store()
+    hits = check_cases(case_numbers, start_date, end_date)
+
+    listed = 0
+    for case_number, listings in hits.items():
+        if listings:
+            listed += 1
+            dates = ', '.join(f"{l['date_of_listing']} ({l['court_type']})" for l in listings)
+            print(f"✅ {case_number}: {dates}")
+        else:
+            print(f"❌ {case_number}: not listed")
+    print(f"\n{listed} of {len(hits)} cases listed")
+    return hits
+
+def main():
+    """Interactive single-case check, or batch mode when case numbers are given"""
+    parser = argparse.ArgumentParser(description="Check whether cases appear in the cause list")
+    parser.add_argument('case_numbers', nargs='*', help="case numbers to check")
+    parser.add_argument('--file', help="file with one case number per line")
+    parser.add_argument('--from', dest='start_date', type=parse_date,
+                        help="first listing date, dd-mm-yyyy (default: tomorrow)")
+    parser.add_argument('--to', dest='end_date', type=parse_date,
+                        help="last listing date, dd-mm-yyyy (default: same as --from)")
+    args = parser.parse_args()
+
+    case_numbers = list(args.case_numbers)
+    if args.file:
+        case_numbers.extend(load_case_numbers(args.file))
+
+    if case_numbers:
+        batch_check(case_numbers, args.start_date, args.end_date)
+    else:
+        check_case()
+
 if __name__ == "__main__":
-    check_case()
\ No newline at end of file
+    main()
@@ -0,0 +1,93 @@
+import re
+from collections import namedtuple
+
+CaseNumber = namedtuple('CaseNumber', ['type', 'number', 'year'])
+
+# Words that precede 'N of YYYY' or 'N/YYYY' in listings without being case types
+NON_CASE_TYPES = ('PAGE', 'ITEM', 'SL', 'SR', 'SNO', 'COURT', 'ROOM', 'HALL', 'DATED', 'TOTAL', 'VS')
+
+# Indian case numbers: a short case type code (WP, CRL, CRL.A, W.P.(C), MA-ST...)
+# followed by the registration number and year, written as WP/12345/2024,
+# WP-12345-2024, CRL.A. No. 45 of 2023, W.P.(C) 1234/2024 or with the No. run
+# straight onto the type as in W.P.No.123/2024 and W.P.(C)No.123/2024
+CASE_NUMBER_RE = re.compile(r'''
+    (?<![\w.])
+    (?!(?:%s)\b)
+    (?P<type>
+        (?!NO\b)[A-Z]{1,6}
+        (?:(?:\.\s?|[&\-])?(?:(?!NO\b)[A-Z]{1,6}|\([A-Z]{1,5}\))){0,3}
+    )
+    \.?
+    (?:
+        \s*[/\-]\s*(?:NO\.?\s*)?    # WP/123, WP-No.123
+      | \s*NO\.?\s*                 # W.P.No.123, CRL.A. No. 45
+      | \s+                          # WP 123
+      | (?<=[.)])                     # Crl.A.45, W.P.(C)123
+    )
+    (?P<number>\d{1,7})
+    \s*(?:/|-|\s+OF\s+)\s*
+    (?P<year>(?:19|20)\d{2})
+    (?!\d)
+''' % '|'.join(NON_CASE_TYPES), re.IGNORECASE | re.VERBOSE)
+
+# Words that mark an element as holding case listings on the district portal
+CAUSE_KEYWORDS_RE = re.compile(r'case no|vs|petitioner|respondent', re.IGNORECASE)
+
+TYPE_NOISE_RE = re.compile(r'[.\s]')
+
+def case_from_match(match):
+    """CaseNumber(type, number, year) from a CASE_NUMBER_RE match"""
+    return CaseNumber(TYPE_NOISE_RE.sub('', match.group('type')).upper().rstrip('-'),
+                      str(int(match.group('number'))),
+                      match.group('year'))
+
+def parse_case_number(text):
+    """First case number in text as CaseNumber(type, number, year), or None"""
+    if not text:
+        return None
+    match = CASE_NUMBER_RE.search(text)
+    return case_from_match(match) if match else None
+
+def parse_case_key(text):
+    """Case number that text starts with as a CaseNumber, or None
+
+    Unlike parse_case_number this does not look past the start of the text, so
+    a cell such as 'CM APPL. 123/2024' or 'Ram Kumar 5/2024' is not read as
+    the case 'APPL/123/2024' or 'KUMAR/5/2024' from its last word.
+    """
+    if not text:
+        return None
+    match = CASE_NUMBER_RE.match(text.strip())
+    return case_from_match(match) if match else None
+
+def find_case_numbers(text):
+    """Every case number in text, in order"""
+    return [case_from_match(match) for match in CASE_NUMBER_RE.finditer(text or '')]
+
+def format_case_number(case):
+    """Canonical TYPE/NUMBER/YEAR form of a CaseNumber"""
+    return f"{case.type}/{case.number}/{case.year}"
+
+def normalize_case_number(text):
+    """Normalized key for matching case numbers typed or scraped in different styles
+
+    'W.P.(C) No. 0123 of 2024' and 'wp(c)/123/2024' both give 'WP(C)/123/2024'.
+    Text that does not start with a recognizable case number is upper-cased
+    with its whitespace collapsed.
+    """
+    case = parse_case_key(text)
+    if case:
+        return format_case_number(case)
+    return ' '.join((text or '').split()).upper()
+
+def find_case_in_row(text_content):
+    """First case number found in a row's cell texts, checking each cell once"""
+    for text in text_content:
+        case = parse_case_number(text)
+        if case:
+            return case
+    return None
+
+def has_cause_keywords(text):
+    """Whether text mentions case-listing keywords"""
+    return bool(text and CAUSE_KEYWORDS_RE.search(text))
@@ -0,0 +1,230 @@
+import codecs
+from html.parser import HTMLParser
+
+try:
+    from lxml import etree
+except ImportError:  # lxml is optional; the tokenizer backend needs only the stdlib
+    etree = None
+
+# Elements whose text becomes a cell, as in the tree-based scrapers' find_all
+CELL_TAGS = frozenset(['td', 'th', 'span', 'div'])
+# Elements html.parser never keeps open
+VOID_TAGS = frozenset(['area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input',
+                       'keygen', 'link', 'meta', 'param', 'source', 'track', 'wbr'])
+# Strings BeautifulSoup's get_text() leaves out
+HIDDEN_TEXT_TAGS = frozenset(['script', 'style', 'template'])
+
+CHUNK_SIZE = 64 * 1024
+
+class RowTokenizer(HTMLParser):
+    """Incremental tokenizer that collects table rows as their </tr> is seen
+
+    It keeps only a stack of open tag names and the cells of open rows, never
+    the document tree. Tags are opened and closed the way BeautifulSoup's
+    html.parser builder does it (an end tag closes the nearest matching open
+    tag, void elements never stay open), so each row's cells and texts equal
+    [cell.get_text(strip=True) for cell in tr.find_all(['td', 'th', 'span', 'div'])].
+
+    Rows come out in the order they close, not in document order: a row holding
+    a nested table follows the nested table's rows, where soup.find_all('tr')
+    lists it first. Flat tables, the usual cause list, come out the same.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.stack = []      # [tag name, cell text parts or None, row cells or None]
+        self.text = []       # text seen since the last tag event
+        self.table_depth = 0
+        self.hidden_depth = 0
+        self.rows = []       # finished rows not yet handed out
+
+    def flush_text(self):
+        if not self.text:
+            return
+        text = ''.join(self.text).strip()
+        self.text = []
+        if not text or self.hidden_depth:
+            return
+        for _, parts, _ in self.stack:
+            if parts is not None:
+                parts.append(text)
+
+    def handle_starttag(self, tag, attrs):
+        self.flush_text()
+        if tag in VOID_TAGS:
+            return
+
+        parts = None
+        open_rows = [row for _, _, row in self.stack if row is not None]
+        if tag in CELL_TAGS and open_rows:
+            parts = []
+            for row in open_rows:
+                row.append(parts)
+
+        self.stack.append([tag, parts, [] if tag == 'tr' else None])
+        if tag == 'table':
+            self.table_depth += 1
+        elif tag in HIDDEN_TEXT_TAGS:
+            self.hidden_depth += 1
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        self.flush_text()
+        for index in range(len(self.stack) - 1, -1, -1):
+            if self.stack[index][0] == tag:
+                break
+        else:
+            return  # stray end tag, ignored like html.parser does
+
+        while len(self.stack) > index:
+            self.close_element(self.stack.pop())
+
+    def close_element(self, element):
+        tag, _, row = element
+        if tag == 'table':
+            self.table_depth -= 1
+        elif tag in HIDDEN_TEXT_TAGS:
+            self.hidden_depth -= 1
+        elif tag == 'tr' and self.table_depth > 0:
+            self.rows.append([''.join(parts) for parts in row])
+
+    def handle_data(self, data):
+        self.text.append(data)
+
+    def handle_comment(self, data):
+        # Comments end a text run in the tree even though their text is dropped
+        self.flush_text()
+
+    handle_decl = handle_pi = unknown_decl = handle_comment
+
+    def finish(self):
+        """Close everything still open at end of input"""
+        self.close()
+        self.flush_text()
+        while self.stack:
+            self.close_element(self.stack.pop())
+
+    def take_rows(self):
+        rows, self.rows = self.rows, []
+        return rows
+
+def iter_rows_tokenizer(chunks, encoding='utf-8'):
+    """Yield table rows from byte or text chunks using the stdlib tokenizer"""
+    tokenizer = RowTokenizer()
+    decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+    for chunk in chunks:
+        if isinstance(chunk, bytes):
+            chunk = decoder.decode(chunk)
+        tokenizer.feed(chunk)
+        yield from tokenizer.take_rows()
+    tokenizer.feed(decoder.decode(b'', final=True))
+    tokenizer.finish()
+    yield from tokenizer.take_rows()
+
+def iter_rows_lxml(chunks, encoding='utf-8'):
+    """Yield table rows from chunks with lxml's pull parser, freeing each row once read
+
+    libxml2 repairs malformed markup differently from html.parser, so on broken
+    HTML the rows can differ from the tokenizer backend.
+    """
+    parser = etree.HTMLPullParser(events=('start', 'end'), encoding=encoding)
+    tr_depth = 0
+
+    def drain():
+        nonlocal tr_depth
+        for event, element in parser.read_events():
+            if element.tag == 'tr':
+                tr_depth += 1 if event == 'start' else -1
+            if event != 'end' or element.tag != 'tr':
+                continue
+            if any(ancestor.tag == 'table' for ancestor in element.iterancestors()):
+                yield [''.join(text.strip() for text in cell.itertext())
+                       for cell in element.iter(*CELL_TAGS)]
+            if tr_depth == 0:
+                # Rows of an enclosing row are still needed until it closes
+                element.clear()
+                while element.getprevious() is not None:
+                    del element.getparent()[0]
+
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode(encoding)
+        parser.feed(chunk)
+        yield from drain()
+    parser.close()
+    yield from drain()
+
+def iter_table_rows(chunks, backend=None, encoding='utf-8'):
+    """Yield the cell texts of every table row in a streamed HTML document
+
+    backend is 'tokenizer' (default; same rows as the BeautifulSoup html.parser
+    scrapers) or 'lxml' (faster, needs lxml installed). Either way a row is
+    yielded when it closes, so rows of a nested table come before the row
+    that contains them.
+    """
+    if backend == 'lxml':
+        if etree is None:
+            raise ImportError("lxml backend requested but lxml is not installed")
+        return iter_rows_lxml(chunks, encoding)
+    return iter_rows_tokenizer(chunks, encoding)
+
+def stream_table_rows(session, url, backend=None, timeout=10):
+    """GET url with a streamed body and yield its table rows as they arrive"""
+    response = session.get(url, timeout=timeout, stream=True)
+    try:
+        response.raise_for_status()
+        # Without a declared charset requests assumes ISO-8859-1; the portals serve UTF-8
+        declared = 'charset' in response.headers.get('Content-Type', '').lower()
+        encoding = response.encoding if declared and response.encoding else 'utf-8'
+        yield from iter_table_rows(response.iter_content(chunk_size=CHUNK_SIZE), backend, encoding)
+    finally:
+        response.close()
+
+# Strategies of enhanced_scrape_high_court, in the order their rows are reported
+CONTAINER_TAGS = frozenset(['div', 'section', 'article'])
+CONTAINER_KEYWORDS = ('case', 'cause', 'list')
+SPECIFIC_TABLE_NAMES = frozenset(['causelist', 'case-list', 'hearing-list'])
+STRATEGIES = ('Case containers', 'Specific tables', 'All tables')
+
+def classify_element(element):
+    """Strategies an element is a candidate for, as a list of strategy indexes"""
+    matched = []
+    if element.name in CONTAINER_TAGS:
+        classes = element.get('class') or []
+        if any(keyword in value.lower() for value in classes for keyword in CONTAINER_KEYWORDS):
+            matched.append(0)
+    elif element.name == 'table':
+        classes = set(element.get('class') or [])
+        if classes & SPECIFIC_TABLE_NAMES or element.get('id') in SPECIFIC_TABLE_NAMES:
+            matched.append(1)
+        matched.append(2)
+    return matched
+
+def extract_candidate_rows(soup):
+    """Yield (strategy, row cell texts) for every candidate row, each row once
+
+    Candidates for all three strategies are classified in a single traversal.
+    A row reachable from several candidates (a table that is both 'specific'
+    and 'all', nested tables, containers holding tables) is parsed and
+    reported once, under the first strategy that reaches it.
+    """
+    candidates = ([], [], [])
+    for element in soup.find_all(True):
+        for strategy in classify_element(element):
+            candidates[strategy].append(element)
+
+    seen = set()
+    for strategy, elements in zip(STRATEGIES, candidates):
+        for element in elements:
+            rows = element.find_all('tr') if element.name == 'table' else element.find_all(['p', 'div'])
+            for row in rows:
+                if id(row) in seen:
+                    continue
+                seen.add(id(row))
+                cells = row.find_all(['td', 'th', 'span', 'div'])
+                if len(cells) >= 2:
+                    yield strategy, [cell.get_text(strip=True) for cell in cells]
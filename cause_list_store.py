@@ -0,0 +1,160 @@
+import json
+import os
+from database import get_db_connection, to_iso_date
+from case_number import normalize_case_number
+
+LISTING_COLUMNS = 'court_type, bench, case_number, party_name, date_of_listing, listing_date, scraped_at'
+DEFAULT_ORDER = 'listing_date, court_type, id'
+
+def init_cause_list_store():
+    """Create the cause list table and its lookup indexes"""
+    conn = get_db_connection()
+    # A listing is one case on one day's list at one bench; the same number can
+    # be listed at two benches of a court on the same day
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS cause_list (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            court_type TEXT NOT NULL,
+            bench TEXT NOT NULL DEFAULT '',
+            case_number TEXT NOT NULL,
+            case_number_norm TEXT NOT NULL,
+            party_name TEXT,
+            date_of_listing TEXT,
+            listing_date TEXT NOT NULL DEFAULT '',
+            scraped_at TEXT,
+            data TEXT NOT NULL,
+            UNIQUE (court_type, bench, case_number_norm, listing_date)
+        )
+    ''')
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_cause_list_case
+        ON cause_list(case_number_norm, listing_date)
+    ''')
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_cause_list_date
+        ON cause_list(listing_date, court_type)
+    ''')
+    conn.commit()
+
+def listing_row(listing):
+    """Column values for one scraped cause list entry"""
+    case_number = (listing.get('case_number') or '').strip()
+    return (
+        listing.get('court_type', ''),
+        listing.get('bench', ''),
+        case_number,
+        normalize_case_number(case_number),
+        listing.get('party_name', ''),
+        listing.get('date_of_listing', ''),
+        to_iso_date(listing.get('date_of_listing')),
+        listing.get('scraped_at', ''),
+        json.dumps(listing, ensure_ascii=False),
+    )
+
+def upsert_listings(listings):
+    """Insert or update scraped entries in one transaction
+
+    Returns the number of distinct listings written; entries repeated within
+    the batch are stored once, as the last of them.
+    """
+    rows = [listing_row(listing) for listing in listings if listing.get('case_number')]
+    if not rows:
+        return 0
+    conn = get_db_connection()
+    try:
+        conn.executemany('''
+            INSERT INTO cause_list
+                (court_type, bench, case_number, case_number_norm, party_name,
+                 date_of_listing, listing_date, scraped_at, data)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (court_type, bench, case_number_norm, listing_date) DO UPDATE SET
+                case_number = excluded.case_number,
+                party_name = excluded.party_name,
+                date_of_listing = excluded.date_of_listing,
+                scraped_at = excluded.scraped_at,
+                data = excluded.data
+        ''', rows)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return len({(row[0], row[1], row[3], row[6]) for row in rows})
+
+def find_listings(case_number, listing_date=None):
+    """Listings of one case, optionally on one date (datetime.date or ISO string)"""
+    query = f'SELECT {LISTING_COLUMNS} FROM cause_list WHERE case_number_norm = ?'
+    params = [normalize_case_number(case_number)]
+    if listing_date:
+        query += ' AND listing_date = ?'
+        params.append(str(listing_date))
+    conn = get_db_connection()
+    rows = conn.execute(query + ' ORDER BY listing_date', params).fetchall()
+    return [dict(row) for row in rows]
+
+def date_range_query(columns, start_date=None, end_date=None, order_by=DEFAULT_ORDER):
+    """SELECT over listings between two dates (inclusive), ordered by date and court"""
+    query = f'SELECT {columns} FROM cause_list WHERE 1 = 1'
+    params = []
+    if start_date:
+        query += ' AND listing_date >= ?'
+        params.append(str(start_date))
+    if end_date:
+        query += ' AND listing_date <= ?'
+        params.append(str(end_date))
+    return query + f' ORDER BY {order_by}', params
+
+def get_listings(start_date=None, end_date=None, limit=None):
+    """Listings between two dates (inclusive), ordered by date and court"""
+    query, params = date_range_query(LISTING_COLUMNS, start_date, end_date)
+    if limit:
+        query += ' LIMIT ?'
+        params.append(limit)
+    conn = get_db_connection()
+    rows = conn.execute(query, params).fetchall()
+    return [dict(row) for row in rows]
+
+def iter_listings(start_date=None, end_date=None, order_by=DEFAULT_ORDER):
+    """Stream listings between two dates row by row, including case_number_norm"""
+    query, params = date_range_query(LISTING_COLUMNS + ', case_number_norm', start_date, end_date, order_by)
+    conn = get_db_connection()
+    for row in conn.execute(query, params):
+        yield dict(row)
+
+def cases_per_bench_per_day(start_date=None, end_date=None):
+    """Number of distinct cases listed per court and bench per day"""
+    query = '''
+        SELECT listing_date, court_type, bench, COUNT(DISTINCT case_number_norm) AS cases
+        FROM cause_list WHERE listing_date != ''
+    '''
+    params = []
+    if start_date:
+        query += ' AND listing_date >= ?'
+        params.append(str(start_date))
+    if end_date:
+        query += ' AND listing_date <= ?'
+        params.append(str(end_date))
+    query += ' GROUP BY listing_date, court_type, bench ORDER BY listing_date, court_type, bench'
+    conn = get_db_connection()
+    return [dict(row) for row in conn.execute(query, params)]
+
+def count_listings():
+    """Number of stored listings"""
+    conn = get_db_connection()
+    count = conn.execute('SELECT COUNT(*) FROM cause_list').fetchone()[0]
+    return count
+
+def import_json(filename='cause_list.json'):
+    """Load a cause_list.json written by earlier versions of the scraper into the store"""
+    if not os.path.exists(filename):
+        return 0
+    with open(filename, 'r', encoding='utf-8') as f:
+        listings = json.load(f)
+    count = upsert_listings(listings)
+    print(f"Imported {count} entries from {filename}")
+    return count
+
+def ensure_cause_list_store(filename='cause_list.json'):
+    """Create the store, importing the legacy JSON file the first time"""
+    init_cause_list_store()
+    if count_listings() == 0:
+        import_json(filename)
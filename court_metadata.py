@@ -0,0 +1,246 @@
+from bs4 import BeautifulSoup
+from datetime import datetime, timedelta
+from database import get_db_connection
+from http_cache import cached_get
+from http_session import get_shared_session
+import ecourts_client
+
+# Court codes change rarely; re-walk the dropdown tree once a week
+METADATA_MAX_AGE = timedelta(days=7)
+
+MAIN_PAGE_URL = ecourts_client.HC_BASE_URL + "main.php"
+
+# fetched_at given to a state whose crawl had failed requests, so the next
+# refresh_metadata() crawls again instead of trusting it for max_age
+INCOMPLETE_FETCHED_AT = datetime.min.isoformat()
+
+def init_metadata_store():
+    """Create the court code table and its lookup indexes"""
+    conn = get_db_connection()
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS court_metadata (
+            level TEXT NOT NULL,
+            parent_key TEXT NOT NULL,
+            code TEXT NOT NULL,
+            name TEXT NOT NULL,
+            fetched_at TIMESTAMP NOT NULL,
+            PRIMARY KEY (level, parent_key, code)
+        )
+    ''')
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_court_metadata_name
+        ON court_metadata(level, parent_key, name COLLATE NOCASE)
+    ''')
+    conn.commit()
+
+def parent_key(*codes):
+    """Key for the options below a chain of selected codes, e.g. state then bench"""
+    return '|'.join(str(code) for code in codes)
+
+def parse_combo(text):
+    """Parse a fill* response ('code~name#code~name...') into (code, name) pairs"""
+    options = []
+    for item in (text or '').split('#'):
+        code, _, name = item.partition('~')
+        code, name = code.strip(), name.strip()
+        if code and code != '0' and name:
+            options.append((code, name))
+    return options
+
+def fetch_states(session):
+    """Read the High Court list from the sess_state_code select on main.php, or None if it is missing"""
+    response = cached_get(session, MAIN_PAGE_URL)
+    response.raise_for_status()
+    soup = BeautifulSoup(response.content, 'html.parser')
+    select = soup.find('select', id='sess_state_code')
+    if not select:
+        # Captcha or error page rather than the court list
+        return None
+    return [(option['value'].split('~')[0], option.get_text(strip=True))
+            for option in select.find_all('option')
+            if option.get('value') not in (None, '', '0')]
+
+def fetch_options(session, action_code, data, in_query=False):
+    """Call one index_qry.php fill* action and parse its options, or None if the request failed"""
+    url = ecourts_client.INDEX_QRY_URL
+    if in_query:
+        url += f"?action_code={action_code}"
+    else:
+        data = {'action_code': action_code, **data}
+    text = ecourts_client.post_endpoint(session, url, data)
+    if text is None:
+        return None
+    return parse_combo(text)
+
+def fetch_benches(session, state_code):
+    """Benches of one High Court (fillHCBench)"""
+    return fetch_options(session, 'fillHCBench', {'state_code': state_code, 'appFlag': 'web'})
+
+def fetch_districts(session, state_code):
+    """Districts of one state (fillDistrict)"""
+    return fetch_options(session, 'fillDistrict', {'state_code': state_code, 'lang_sel': 'E',
+                                                   'lstatelang': '', 'appFlag': 'web'})
+
+def fetch_complexes(session, state_code, dist_code):
+    """Court complexes of one district (fillCourtComplex)"""
+    return fetch_options(session, 'fillCourtComplex', {'state_code': state_code, 'dist_code': dist_code})
+
+def fetch_case_types(session, state_code, bench_code):
+    """Case types registered at one bench (fillCaseType)"""
+    return fetch_options(session, 'fillCaseType', {'court_code': bench_code, 'state_code': state_code},
+                         in_query=True)
+
+def fetch_court_numbers(session, state_code, bench_code):
+    """Court numbers/names with a cause list at one bench (fillCauseListCourtName)"""
+    return fetch_options(session, 'fillCauseListCourtName',
+                         {'court_code': bench_code, 'state_code': state_code, 'dist_code': 1,
+                          'court_complex_code': bench_code, 'appFlag': ''},
+                         in_query=True)
+
+def save_options(conn, level, parent, options, fetched_at):
+    """Replace the stored options below one parent; returns False if options is None
+
+    None means the fetch failed, so the options already stored are kept
+    rather than replaced with nothing.
+    """
+    if options is None:
+        return False
+    conn.execute('DELETE FROM court_metadata WHERE level = ? AND parent_key = ?', (level, parent))
+    conn.executemany('''
+        INSERT INTO court_metadata (level, parent_key, code, name, fetched_at)
+        VALUES (?, ?, ?, ?, ?)
+    ''', [(level, parent, code, name, fetched_at) for code, name in options])
+    return True
+
+def upsert_options(conn, level, parent, options, fetched_at):
+    """Insert or update some options below one parent, keeping the others stored"""
+    conn.executemany('''
+        INSERT INTO court_metadata (level, parent_key, code, name, fetched_at)
+        VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT (level, parent_key, code) DO UPDATE SET
+            name = excluded.name,
+            fetched_at = excluded.fetched_at
+    ''', [(level, parent, code, name, fetched_at) for code, name in options])
+
+def stored_options(conn, level, parent=''):
+    """(code, name) options stored for a level below a parent key"""
+    rows = conn.execute('''
+        SELECT code, name FROM court_metadata
+        WHERE level = ? AND parent_key = ? ORDER BY name
+    ''', (level, parent)).fetchall()
+    return [(row['code'], row['name']) for row in rows]
+
+def crawl_metadata(session=None, state_codes=None, include_districts=False):
+    """Walk the dropdown tree once and store every level
+
+    High Court benches are expanded into their case types and court numbers;
+    district/complex levels are walked too when include_districts is set.
+    Each state is committed on its own so an interrupted crawl keeps progress.
+    A failed request keeps the options stored before, and its state is marked
+    to be crawled again on the next refresh.
+    """
+    session = session or get_shared_session()
+    init_metadata_store()
+    fetched_at = datetime.now().isoformat()
+    conn = get_db_connection()
+
+    try:
+        states = fetch_states(session)
+        if states is None:
+            print("Could not read the High Court list - stored court metadata kept")
+            return
+        if state_codes:
+            # Only the selected states are refreshed; the rest of the list stays as stored
+            states = [state for state in states if state[0] in {str(code) for code in state_codes}]
+            upsert_options(conn, 'state', '', states, fetched_at)
+        else:
+            save_options(conn, 'state', '', states, fetched_at)
+        conn.commit()
+        print(f"Crawling court metadata for {len(states)} High Courts...")
+
+        for state_code, state_name in states:
+            complete = save_options(conn, 'bench', parent_key(state_code),
+                                    fetch_benches(session, state_code), fetched_at)
+            benches = stored_options(conn, 'bench', parent_key(state_code))
+
+            for bench_code, _ in benches:
+                bench_parent = parent_key(state_code, bench_code)
+                complete &= save_options(conn, 'case_type', bench_parent,
+                                         fetch_case_types(session, state_code, bench_code), fetched_at)
+                complete &= save_options(conn, 'court_no', bench_parent,
+                                         fetch_court_numbers(session, state_code, bench_code), fetched_at)
+
+            if include_districts:
+                complete &= save_options(conn, 'district', parent_key(state_code),
+                                         fetch_districts(session, state_code), fetched_at)
+                for dist_code, _ in stored_options(conn, 'district', parent_key(state_code)):
+                    complete &= save_options(conn, 'complex', parent_key(state_code, dist_code),
+                                             fetch_complexes(session, state_code, dist_code), fetched_at)
+
+            if not complete:
+                conn.execute("UPDATE court_metadata SET fetched_at = ? WHERE level = 'state' AND code = ?",
+                             (INCOMPLETE_FETCHED_AT, state_code))
+            conn.commit()
+            print(f"Stored {len(benches)} benches for {state_name}"
+                  + ("" if complete else " (some requests failed - will retry on next refresh)"))
+    except Exception:
+        # Drop the half-written state so a later commit on this connection can't pick it up
+        conn.rollback()
+        raise
+
+def last_refreshed():
+    """When the High Court list was last crawled, or None if never"""
+    init_metadata_store()
+    conn = get_db_connection()
+    row = conn.execute("SELECT MIN(fetched_at) FROM court_metadata WHERE level = 'state'").fetchone()
+    return datetime.fromisoformat(row[0]) if row[0] else None
+
+def refresh_metadata(session=None, force=False, max_age=METADATA_MAX_AGE):
+    """Re-crawl the metadata if it is missing or older than max_age; returns True if crawled"""
+    refreshed = last_refreshed()
+    if not force and refreshed and datetime.now() - refreshed < max_age:
+        print(f"Court metadata is current (last refreshed {refreshed:%d-%m-%Y %H:%M})")
+        return False
+    crawl_metadata(session)
+    return True
+
+def get_options(level, parent=''):
+    """Stored (code, name) options for a level below a parent key"""
+    init_metadata_store()
+    return stored_options(get_db_connection(), level, parent)
+
+def find_code(conn, level, parent, name):
+    """Code of the option named name (case-insensitive, exact then prefix match)"""
+    for pattern in (name, f"{name}%"):
+        row = conn.execute('''
+            SELECT code FROM court_metadata
+            WHERE level = ? AND parent_key = ? AND name LIKE ?
+            ORDER BY length(name) LIMIT 1
+        ''', (level, parent, pattern)).fetchone()
+        if row:
+            return row['code']
+    return None
+
+def resolve_court_codes(state_name, bench_name, case_type_name):
+    """Resolve High Court, bench and case type names to the portal's codes from the store
+
+    Returns the dict scrape_case_by_number expects as court, or None if any level
+    is unknown (run refresh_metadata first).
+    """
+    if not all([state_name, bench_name, case_type_name]):
+        return None
+    init_metadata_store()
+    conn = get_db_connection()
+    state_code = find_code(conn, 'state', '', state_name)
+    if not state_code:
+        return None
+    bench_code = find_code(conn, 'bench', parent_key(state_code), bench_name)
+    if not bench_code:
+        return None
+    case_type_code = find_code(conn, 'case_type', parent_key(state_code, bench_code), case_type_name)
+    if not case_type_code:
+        return None
+    return {'state_code': state_code, 'court_code': bench_code, 'case_type_code': case_type_code}
+
+if __name__ == "__main__":
+    refresh_metadata()
@@ -0,0 +1,79 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+# Defaults for a nightly crawl across many benches and complexes
+MAX_WORKERS = 8
+PER_HOST_CONCURRENCY = 2
+PER_HOST_MIN_INTERVAL = 1.0  # seconds between two request starts on one host
+
+class HostLimiter:
+    """Limit concurrent requests and request rate separately for every host"""
+
+    def __init__(self, max_concurrency=PER_HOST_CONCURRENCY, min_interval=PER_HOST_MIN_INTERVAL):
+        self.max_concurrency = max_concurrency
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._semaphores = {}
+        self._next_start = {}
+
+    def _semaphore(self, host):
+        with self._lock:
+            if host not in self._semaphores:
+                self._semaphores[host] = threading.BoundedSemaphore(self.max_concurrency)
+            return self._semaphores[host]
+
+    def acquire(self, host):
+        """Block until a request to host may start"""
+        self._semaphore(host).acquire()
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start.get(host, now))
+            self._next_start[host] = start + self.min_interval
+        if start > now:
+            time.sleep(start - now)
+
+    def release(self, host):
+        self._semaphore(host).release()
+
+def target_host(target):
+    """Host a crawl target talks to, used as the rate limiting key"""
+    return urlparse(target['url']).netloc
+
+def run_target(target, session, limiter):
+    """Run one target's scraper inside its host limits"""
+    host = target_host(target)
+    limiter.acquire(host)
+    started = time.monotonic()
+    try:
+        return target['scraper'](session, **target.get('params', {}))
+    except Exception as e:
+        print(f"Error crawling {target['name']}: {e}")
+        return []
+    finally:
+        limiter.release(host)
+        print(f"Finished {target['name']} in {time.monotonic() - started:.2f}s")
+
+def crawl(targets, session, max_workers=MAX_WORKERS, limiter=None):
+    """Scrape all court targets concurrently and return their listings in target order
+
+    Each target is a dict with 'name', 'url' and a 'scraper' callable taking the
+    session (plus optional keyword 'params'). Targets on different hosts run in
+    parallel; targets on the same host share that host's concurrency and rate limit.
+    """
+    if not targets:
+        return []
+
+    limiter = limiter or HostLimiter()
+    workers = max(1, min(max_workers, len(targets)))
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(run_target, target, session, limiter) for target in targets]
+        results = [future.result() for future in futures]
+
+    all_listings = []
+    for target, listings in zip(targets, results):
+        print(f"Collected {len(listings)} entries from {target['name']}")
+        all_listings.extend(listings)
+    return all_listings
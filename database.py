@@ -1,15 +1,95 @@
+import hashlib
+import re
 import sqlite3
+import threading
 import json
+from collections.abc import Mapping
 from datetime import datetime
+from case_number import parse_case_key, format_case_number, normalize_case_number
 
 DATABASE = 'court_queries.db'
 
-def get_db_connection():
-    """Get database connection"""
-    conn = sqlite3.connect(DATABASE)
+# Pragmas applied to every connection: WAL lets readers run alongside a writer,
+# NORMAL sync is safe under WAL and avoids an fsync per commit
+PRAGMAS = (
+    'PRAGMA journal_mode = WAL',
+    'PRAGMA synchronous = NORMAL',
+    'PRAGMA foreign_keys = ON',
+    'PRAGMA temp_store = MEMORY',
+    'PRAGMA cache_size = -16000',
+)
+BUSY_TIMEOUT = 30  # seconds to wait on a locked database before failing
+
+_local = threading.local()
+
+POOL_SIZE = 8  # idle connections kept for reuse by threads that come and go
+_pool = []
+_pool_lock = threading.Lock()
+
+LISTING_DATE_RE = re.compile(r'(\d{1,2})[-/.](\d{1,2})[-/.](\d{4})')
+
+# Fields that change on every scrape and are left out of the payload hash
+VOLATILE_FIELDS = ('scraped_at',)
+
+# Whether party names are searched through the payloads_fts index (set by init_db)
+PARTY_SEARCH_FTS = False
+
+def open_connection(path=None):
+    """Open a new tuned connection"""
+    conn = sqlite3.connect(path or DATABASE, timeout=BUSY_TIMEOUT, check_same_thread=False)
     conn.row_factory = sqlite3.Row
+    for pragma in PRAGMAS:
+        conn.execute(pragma)
     return conn
 
+def get_db_connection():
+    """Get this thread's database connection
+
+    A thread keeps its connection until it calls release_db_connection() (Flask
+    does this when the app context ends), which hands it to the next thread
+    instead of closing it, so the pragmas only run when the pool is empty.
+    """
+    conn = getattr(_local, 'conn', None)
+    if conn is not None and _local.path == DATABASE:
+        return conn
+    if conn is not None:
+        conn.close()
+        conn = None
+    with _pool_lock:
+        while _pool and conn is None:
+            path, pooled = _pool.pop()
+            if path == DATABASE:
+                conn = pooled
+            else:
+                pooled.close()
+    _local.conn = conn or open_connection()
+    _local.path = DATABASE
+    return _local.conn
+
+def release_db_connection(exception=None):
+    """Roll back anything left uncommitted and return this thread's connection to the pool"""
+    conn = getattr(_local, 'conn', None)
+    if conn is None:
+        return
+    _local.conn = None
+    conn.rollback()
+    with _pool_lock:
+        if len(_pool) < POOL_SIZE and _local.path == DATABASE:
+            _pool.append((_local.path, conn))
+            return
+    conn.close()
+
+def close_db_connection(exception=None):
+    """Close this thread's connection if one is open"""
+    conn = getattr(_local, 'conn', None)
+    if conn is not None:
+        _local.conn = None
+        conn.close()
+
+def init_app(app):
+    """Return each request's connection to the pool when the Flask app context ends"""
+    app.teardown_appcontext(release_db_connection)
+
 def init_db():
     """Initialize database with required tables"""
     conn = get_db_connection()
@@ -23,38 +103,489 @@ def init_db():
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         )
     ''')
+    # Serves the newest-first history pages without sorting the whole table
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_queries_created_at
+        ON queries(created_at, id)
+    ''')
+    # History searches by case match the normalized number (case_key), so
+    # 'wp/1' + 2024 finds lookups typed as 'WP/1/2024'; type + number lookups
+    # come back already in created_at order, number-only ones use the second index
+    add_column(conn, 'queries', 'case_number_norm', 'TEXT')
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_queries_case_key
+        ON queries(case_type COLLATE NOCASE, case_number_norm, created_at)
+    ''')
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_queries_number_key
+        ON queries(case_number_norm, created_at)
+    ''')
+    migrate_query_case_keys(conn)
+    init_payload_tables(conn)
+    init_party_search(conn)
+    init_case_tables(conn)
+    migrate_query_payloads(conn)
+    migrate_queries_to_snapshots(conn)
     conn.commit()
-    conn.close()
+
+def add_column(conn, table, column, definition):
+    """Add a column to a table created by an older version, returning whether it was missing"""
+    if column in {row['name'] for row in conn.execute(f'PRAGMA table_info({table})')}:
+        return False
+    conn.execute(f'ALTER TABLE {table} ADD COLUMN {column} {definition}')
+    return True
+
+def init_payload_tables(conn):
+    """Create the content-addressed payload store and the case change log"""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS query_payloads (
+            payload_hash TEXT PRIMARY KEY,
+            payload TEXT NOT NULL,
+            first_seen TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    add_column(conn, 'queries', 'payload_hash', 'TEXT REFERENCES query_payloads(payload_hash)')
+    # Only the fields that differ between consecutive lookups of a case
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS case_changes (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            case_id INTEGER NOT NULL REFERENCES cases(id),
+            query_id INTEGER NOT NULL REFERENCES queries(id),
+            field TEXT NOT NULL,
+            old_value TEXT,
+            new_value TEXT,
+            changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_case_changes_case
+        ON case_changes(case_id, id)
+    ''')
+
+def split_payload(response_data):
+    """(stable fields, volatile fields) of a scraped case; only the stable part is hashed"""
+    stable = {key: value for key, value in response_data.items() if key not in VOLATILE_FIELDS}
+    volatile = {key: value for key, value in response_data.items() if key in VOLATILE_FIELDS}
+    return stable, volatile
+
+def payload_hash(stable):
+    """SHA-256 of a payload's canonical JSON, independent of key order"""
+    canonical = json.dumps(stable, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+def store_payload(conn, response_data):
+    """Store a case payload once by content hash
+
+    Returns (payload_hash, volatile fields JSON) for the queries row, or
+    (None, full JSON) for responses that are not dicts.
+    """
+    if not isinstance(response_data, dict):
+        return None, json.dumps(response_data)
+    stable, volatile = split_payload(response_data)
+    digest = payload_hash(stable)
+    cursor = conn.execute('INSERT OR IGNORE INTO query_payloads (payload_hash, payload) VALUES (?, ?)',
+                          (digest, json.dumps(stable)))
+    if cursor.rowcount and PARTY_SEARCH_FTS:
+        # Party names are indexed once per distinct payload, not per lookup
+        conn.execute('INSERT INTO payloads_fts (party_names, payload_hash) VALUES (?, ?)',
+                     (party_text(stable), digest))
+    return digest, json.dumps(volatile)
+
+def migrate_query_payloads(conn):
+    """Move full response blobs of older queries into the payload store"""
+    rows = conn.execute('SELECT id, response_data FROM queries WHERE payload_hash IS NULL').fetchall()
+    moved = 0
+    for row in rows:
+        digest, response_data = store_payload(conn, json.loads(row['response_data']))
+        if digest:
+            conn.execute('UPDATE queries SET payload_hash = ?, response_data = ? WHERE id = ?',
+                         (digest, response_data, row['id']))
+            moved += 1
+    if moved:
+        print(f"Moved {moved} saved responses to the payload store")
+
+def record_changes(conn, case_id, query_id, old, new):
+    """Log the stable fields that differ between two payloads of a case"""
+    changes = [(case_id, query_id, field,
+                None if field not in old else json.dumps(old[field], ensure_ascii=False),
+                None if field not in new else json.dumps(new[field], ensure_ascii=False))
+               for field in sorted(old.keys() | new.keys())
+               if old.get(field) != new.get(field) or (field in old) != (field in new)]
+    conn.executemany('''
+        INSERT INTO case_changes (case_id, query_id, field, old_value, new_value)
+        VALUES (?, ?, ?, ?, ?)
+    ''', changes)
+    return len(changes)
+
+def init_case_tables(conn):
+    """Create the normalized cases and case_snapshots tables"""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS cases (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            case_type TEXT NOT NULL,
+            case_number TEXT NOT NULL,
+            case_number_norm TEXT NOT NULL,
+            year TEXT NOT NULL DEFAULT '',
+            cino TEXT,
+            last_payload_hash TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE (case_type, case_number_norm)
+        )
+    ''')
+    # One row per scrape of a case: what the court said about it at that time
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS case_snapshots (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            case_id INTEGER NOT NULL REFERENCES cases(id),
+            query_id INTEGER REFERENCES queries(id),
+            court_name TEXT NOT NULL DEFAULT '',
+            party_name TEXT,
+            date_of_listing TEXT,
+            listing_date TEXT NOT NULL DEFAULT '',
+            status TEXT,
+            scraped_at TEXT,
+            payload_hash TEXT
+        )
+    ''')
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_case_snapshots_case
+        ON case_snapshots(case_id, scraped_at)
+    ''')
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_case_snapshots_listing
+        ON case_snapshots(listing_date, court_name)
+    ''')
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_case_snapshots_query
+        ON case_snapshots(query_id)
+    ''')
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_case_snapshots_payload
+        ON case_snapshots(payload_hash, case_id)
+    ''')
+
+def to_iso_date(date_of_listing):
+    """ISO date (yyyy-mm-dd) from a scraped dd-mm-yyyy listing date, or '' if none"""
+    match = LISTING_DATE_RE.search(date_of_listing or '')
+    if not match:
+        return ''
+    day, month, year = (int(part) for part in match.groups())
+    try:
+        return datetime(year, month, day).strftime('%Y-%m-%d')
+    except ValueError:
+        return ''
+
+def case_key(case_number, year=''):
+    """(case_number_norm, year) identifying a case however its number was written
+
+    'WP/123' with year '2024' and a scraped 'W.P. No. 123 of 2024' give the same key.
+    A number that does not parse has the year appended, so '12345' in 2023 and
+    in 2024 stay separate cases.
+    """
+    case_number = (case_number or '').strip()
+    case = parse_case_key(case_number) or (year and parse_case_key(f"{case_number}/{year}"))
+    if case:
+        return format_case_number(case), case.year
+    case_number_norm, year = normalize_case_number(case_number), str(year or '')
+    return (f"{case_number_norm}/{year}" if year else case_number_norm), year
+
+def migrate_query_case_keys(conn):
+    """Fill case_number_norm for queries saved before it was stored"""
+    rows = conn.execute('SELECT id, case_number, year FROM queries WHERE case_number_norm IS NULL').fetchall()
+    conn.executemany('UPDATE queries SET case_number_norm = ? WHERE id = ?',
+                     ((case_key(row['case_number'], row['year'])[0], row['id']) for row in rows))
+
+def get_case_id(conn, case_type, case_number, year='', cino=None):
+    """Id of the case row for a case number, creating it on first sight"""
+    case_number_norm, year = case_key(case_number, year)
+    conn.execute('''
+        INSERT INTO cases (case_type, case_number, case_number_norm, year, cino)
+        VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT (case_type, case_number_norm) DO UPDATE SET
+            cino = COALESCE(excluded.cino, cino)
+    ''', (case_type or '', (case_number or '').strip(), case_number_norm, year, cino))
+    return conn.execute('SELECT id FROM cases WHERE case_type = ? AND case_number_norm = ?',
+                        (case_type or '', case_number_norm)).fetchone()[0]
+
+def save_snapshot(conn, case_data, query_id=None, case_type=None, case_number=None, year=None,
+                  payload_hash=None):
+    """Record one scrape of a case in the normalized tables; returns the case id
+
+    With a payload_hash, a scrape identical to one the case already has a
+    snapshot of adds no row; its query references that payload instead.
+    """
+    case_id = get_case_id(conn,
+                          case_type or case_data.get('case_type') or case_data.get('court_type'),
+                          case_number or case_data.get('case_number'),
+                          year or case_data.get('year', ''),
+                          case_data.get('cino'))
+    if payload_hash and conn.execute('SELECT 1 FROM case_snapshots WHERE payload_hash = ? AND case_id = ?',
+                                     (payload_hash, case_id)).fetchone():
+        return case_id
+    conn.execute('''
+        INSERT INTO case_snapshots
+            (case_id, query_id, court_name, party_name, date_of_listing, listing_date, status, scraped_at,
+             payload_hash)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', (case_id, query_id,
+          case_data.get('court_name') or case_data.get('court_type') or '',
+          case_data.get('party_name'),
+          case_data.get('date_of_listing'),
+          to_iso_date(case_data.get('date_of_listing')),
+          case_data.get('status'),
+          case_data.get('scraped_at'),
+          payload_hash))
+    return case_id
+
+def migrate_queries_to_snapshots(conn):
+    """Copy saved queries that have no snapshot yet into the normalized tables
+
+    Each case then remembers the payload of its latest lookup for change detection.
+    """
+    rows = conn.execute(f'''
+        SELECT {QUERY_COLUMNS}, payload_hash FROM {QUERY_SOURCE}
+        WHERE id NOT IN (SELECT query_id FROM case_snapshots WHERE query_id IS NOT NULL)
+          AND (payload_hash IS NULL OR payload_hash NOT IN
+               (SELECT payload_hash FROM case_snapshots WHERE payload_hash IS NOT NULL))
+        ORDER BY id
+    ''').fetchall()
+    for row in rows:
+        case_data = QueryRecord(row)['response_data']
+        if isinstance(case_data, dict):
+            save_snapshot(conn, case_data, row['id'], row['case_type'], row['case_number'], row['year'],
+                          row['payload_hash'])
+    if rows:
+        print(f"Migrated {len(rows)} saved queries to case snapshots")
+    conn.execute('''
+        UPDATE cases SET last_payload_hash = (
+            SELECT queries.payload_hash FROM case_snapshots JOIN queries ON queries.id = case_snapshots.query_id
+            WHERE case_snapshots.case_id = cases.id ORDER BY queries.id DESC LIMIT 1)
+        WHERE last_payload_hash IS NULL
+    ''')
+
+def party_text(response_data):
+    """Party names from a saved response, as one searchable string"""
+    if not isinstance(response_data, dict):
+        return ''
+    names = [response_data.get(key) for key in ('party_name', 'petitioner', 'respondent')]
+    return ' '.join(str(name) for name in names if name)
+
+def init_party_search(conn):
+    """Create the FTS5 party name index if SQLite supports it"""
+    global PARTY_SEARCH_FTS
+    try:
+        conn.execute('CREATE VIRTUAL TABLE IF NOT EXISTS payloads_fts USING fts5(party_names, payload_hash UNINDEXED)')
+    except sqlite3.OperationalError:
+        PARTY_SEARCH_FTS = False  # no FTS5 in this build; search_queries falls back to LIKE
+        return
+    PARTY_SEARCH_FTS = True
+
+def previous_payload(conn, case_id):
+    """(payload_hash, payload) of the last lookup of a case, or (None, None)"""
+    row = conn.execute('''
+        SELECT last_payload_hash, payload FROM cases
+        LEFT JOIN query_payloads ON query_payloads.payload_hash = cases.last_payload_hash
+        WHERE cases.id = ?
+    ''', (case_id,)).fetchone()
+    if not row or not row['payload']:
+        return None, None
+    return row['last_payload_hash'], json.loads(row['payload'])
 
 def save_query(case_type, case_number, year, response_data):
-    """Save a query and its response to database"""
+    """Save a query and its response to database
+
+    The response is stored once per distinct content: a repeat lookup that
+    scraped the same data only references the earlier payload and snapshot,
+    and a lookup that differs from the case's previous one logs the changed
+    fields in case_changes.
+    """
     conn = get_db_connection()
+    digest, stored_data = store_payload(conn, response_data)
     cursor = conn.execute('''
-        INSERT INTO queries (case_type, case_number, year, response_data)
-        VALUES (?, ?, ?, ?)
-    ''', (case_type, case_number, year, json.dumps(response_data)))
+        INSERT INTO queries (case_type, case_number, case_number_norm, year, response_data, payload_hash)
+        VALUES (?, ?, ?, ?, ?, ?)
+    ''', (case_type, case_number, case_key(case_number, year)[0], year, stored_data, digest))
     query_id = cursor.lastrowid
+    if isinstance(response_data, dict):
+        case_id = save_snapshot(conn, response_data, query_id, case_type, case_number, year, digest)
+        old_hash, old_payload = previous_payload(conn, case_id)
+        if old_hash and old_hash != digest:
+            record_changes(conn, case_id, query_id, old_payload, split_payload(response_data)[0])
+        conn.execute('UPDATE cases SET last_payload_hash = ? WHERE id = ?', (digest, case_id))
     conn.commit()
-    conn.close()
     return query_id
 
+def get_case_changes(case_type, case_number, year=''):
+    """Logged field changes of a case, oldest first"""
+    case_number_norm, _ = case_key(case_number, year)
+    conn = get_db_connection()
+    rows = conn.execute('''
+        SELECT case_changes.query_id, field, old_value, new_value, changed_at
+        FROM case_changes JOIN cases ON cases.id = case_changes.case_id
+        WHERE cases.case_type = ? AND cases.case_number_norm = ?
+        ORDER BY case_changes.id
+    ''', (case_type, case_number_norm)).fetchall()
+    return [dict(row, old_value=json.loads(row['old_value']) if row['old_value'] is not None else None,
+                 new_value=json.loads(row['new_value']) if row['new_value'] is not None else None)
+            for row in rows]
+
+QUERY_COLUMNS = 'id, case_type, case_number, year, response_data, payload, created_at'
+
+# Saved queries joined to their content-addressed payloads
+QUERY_SOURCE = 'queries LEFT JOIN query_payloads USING (payload_hash)'
+
+DEFAULT_PAGE_SIZE = 25
+MAX_PAGE_SIZE = 200
+
+class QueryRecord(Mapping):
+    """A saved query row that decodes its response_data JSON only when accessed
+
+    Behaves like the dicts get_all_queries used to return, so templates and the
+    PDF generator keep using query['field'] / query.field.
+    """
+
+    FIELDS = ('id', 'case_type', 'case_number', 'year', 'response_data', 'created_at')
+
+    def __init__(self, row):
+        self._row = row
+        self._response_data = None
+        self._decoded = False
+
+    def __getitem__(self, key):
+        if key == 'response_data':
+            if not self._decoded:
+                data = json.loads(self._row['response_data'])
+                if self._row['payload'] is not None:
+                    # Shared payload plus this lookup's own volatile fields
+                    data = {**json.loads(self._row['payload']), **data}
+                self._response_data = data
+                self._decoded = True
+            return self._response_data
+        if key not in self.FIELDS:
+            raise KeyError(key)
+        return self._row[key]
+
+    def __iter__(self):
+        return iter(self.FIELDS)
+
+    def __len__(self):
+        return len(self.FIELDS)
+
+    def __repr__(self):
+        return f"QueryRecord(id={self._row['id']}, case_number={self._row['case_number']!r})"
+
+def get_query(query_id):
+    """Get one saved query by primary key, or None if it does not exist"""
+    conn = get_db_connection()
+    row = conn.execute(f'SELECT {QUERY_COLUMNS} FROM {QUERY_SOURCE} WHERE id = ?', (query_id,)).fetchone()
+    return QueryRecord(row) if row else None
+
 def get_all_queries():
     """Get all saved queries"""
     conn = get_db_connection()
-    queries = conn.execute('''
-        SELECT id, case_type, case_number, year, response_data, created_at
-        FROM queries ORDER BY created_at DESC
+    queries = conn.execute(f'''
+        SELECT {QUERY_COLUMNS}
+        FROM {QUERY_SOURCE} ORDER BY created_at DESC
     ''').fetchall()
-    conn.close()
-    
-    result = []
-    for query in queries:
-        result.append({
-            'id': query['id'],
-            'case_type': query['case_type'],
-            'case_number': query['case_number'],
-            'year': query['year'],
-            'response_data': json.loads(query['response_data']),
-            'created_at': query['created_at']
-        })
-    return result
\ No newline at end of file
+
+    return [QueryRecord(query) for query in queries]
+
+def encode_cursor(query):
+    """Opaque page cursor pointing just past a saved query"""
+    return f"{query['created_at']}|{query['id']}"
+
+def decode_cursor(cursor):
+    """(created_at, id) from a page cursor, or None if it is missing or malformed"""
+    created_at, _, query_id = (cursor or '').rpartition('|')
+    if not created_at or not query_id.isdigit():
+        return None
+    return created_at, int(query_id)
+
+def fts_phrase(text):
+    """FTS5 query matching every word of text as a prefix"""
+    return ' '.join('"' + word.replace('"', '""') + '"*' for word in text.split())
+
+def search_queries(case_type=None, case_number=None, year=None, party=None,
+                   start_date=None, end_date=None, limit=DEFAULT_PAGE_SIZE, before=None):
+    """One page of saved queries matching the given filters, newest first
+
+    Case type matches ignoring case and the case number by its normalized key,
+    so 'wp/1' with year 2024 and 'WP/1/2024' find the same lookups (a number
+    given without a year matches every year); party matches words in the party
+    names; start_date/end_date (ISO dates, inclusive) bound when the search was
+    run. Paginates like get_queries_page and returns (queries, next_cursor).
+    """
+    limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+    query = f'SELECT {QUERY_COLUMNS} FROM {QUERY_SOURCE} WHERE 1 = 1'
+    params = []
+    year = (year or '').strip()
+    if case_type and case_type.strip():
+        query += ' AND case_type = ? COLLATE NOCASE'
+        params.append(case_type.strip())
+    if case_number and case_number.strip():
+        case_number_norm, key_year = case_key(case_number, year)
+        if key_year:
+            query += ' AND case_number_norm = ?'
+            params.append(case_number_norm)
+        else:
+            query += " AND (case_number_norm = ? OR case_number_norm GLOB ?)"
+            pattern = re.sub(r'([*?\[])', r'[\1]', case_number_norm)
+            params.extend([case_number_norm, pattern + '/[12][0-9][0-9][0-9]'])
+    if year:
+        query += ' AND year = ?'
+        params.append(year)
+    if start_date:
+        query += ' AND created_at >= ?'
+        params.append(str(start_date))
+    if end_date:
+        query += " AND created_at < date(?, '+1 day')"
+        params.append(str(end_date))
+    if party and party.strip():
+        if PARTY_SEARCH_FTS:
+            query += ' AND payload_hash IN (SELECT payload_hash FROM payloads_fts WHERE payloads_fts MATCH ?)'
+            params.append(fts_phrase(party))
+        else:
+            query += " AND COALESCE(payload, response_data) LIKE ? ESCAPE '\\'"
+            params.append('%' + party.strip().replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%')
+    position = decode_cursor(before)
+    if position:
+        query += ' AND (created_at, id) < (?, ?)'
+        params.extend(position)
+    query += ' ORDER BY created_at DESC, id DESC LIMIT ?'
+    # Fetch one extra row to know whether another page follows
+    params.append(limit + 1)
+
+    conn = get_db_connection()
+    rows = conn.execute(query, params).fetchall()
+    queries = [QueryRecord(row) for row in rows[:limit]]
+    next_cursor = encode_cursor(queries[-1]) if len(rows) > limit else None
+    return queries, next_cursor
+
+def get_queries_page(limit=DEFAULT_PAGE_SIZE, before=None):
+    """One page of saved queries, newest first
+
+    Uses keyset pagination on (created_at, id): pass the previous page's cursor
+    as before to get the next page. Returns (queries, next_cursor), with
+    next_cursor None on the last page.
+    """
+    return search_queries(limit=limit, before=before)
+
+def listings_per_court_per_day(start_date=None, end_date=None):
+    """Number of distinct looked-up cases listed per court per day, from the case snapshots
+
+    Crawled cause lists are counted by cause_list_store.cases_per_bench_per_day.
+    """
+    query = '''
+        SELECT listing_date, court_name, COUNT(DISTINCT case_id) AS cases
+        FROM case_snapshots WHERE listing_date != ''
+    '''
+    params = []
+    if start_date:
+        query += ' AND listing_date >= ?'
+        params.append(str(start_date))
+    if end_date:
+        query += ' AND listing_date <= ?'
+        params.append(str(end_date))
+    query += ' GROUP BY listing_date, court_name ORDER BY listing_date, court_name'
+    conn = get_db_connection()
+    return [dict(row) for row in conn.execute(query, params)]
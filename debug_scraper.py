@@ -1,8 +1,10 @@
-import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, NavigableString
 import json
 from datetime import datetime
 import time
+from http_session import get_shared_session
+from cause_list_parser import stream_table_rows, extract_candidate_rows
+from case_number import CAUSE_KEYWORDS_RE, find_case_in_row
 
 def debug_response(url, session):
     """Debug function to analyze website response"""
@@ -41,6 +43,20 @@ def debug_response(url, session):
         print(f"Debug error for {url}: {e}")
         return None, None
 
+def make_case_data(court_type, text_content, case=None):
+    """Build a cause list entry from a row's cell texts and its recognized case number"""
+    case_data = {
+        'court_type': court_type,
+        'case_number': text_content[0] if text_content else '',
+        'party_name': text_content[1] if len(text_content) > 1 else '',
+        'date_of_listing': text_content[2] if len(text_content) > 2 else '',
+        'scraped_at': datetime.now().isoformat(),
+        'raw_data': text_content
+    }
+    if case:
+        case_data['case_number_parts'] = case._asdict()
+    return case_data
+
 def enhanced_scrape_high_court(session):
     """Enhanced scraper with multiple strategies"""
     url = "https://hcservices.ecourts.gov.in/hcservices/main.php"
@@ -50,46 +66,40 @@ def enhanced_scrape_high_court(session):
     if not soup:
         return cause_list
     
-    # Strategy 1: Look for any div/section with case-like content
-    case_containers = soup.find_all(['div', 'section', 'article'], 
-                                   class_=lambda x: x and any(
-                                       keyword in x.lower() for keyword in ['case', 'cause', 'list']
-                                   ))
-    
-    # Strategy 2: Look for specific table classes/IDs
-    specific_tables = soup.find_all('table', {'class': ['causelist', 'case-list', 'hearing-list']})
-    specific_tables.extend(soup.find_all('table', {'id': ['causelist', 'case-list', 'hearing-list']}))
-    
-    # Strategy 3: All tables (original approach)
-    all_tables = soup.find_all('table')
-    
-    print(f"Case containers: {len(case_containers)}")
-    print(f"Specific tables: {len(specific_tables)}")
-    print(f"All tables: {len(all_tables)}")
-    
-    # Try each strategy
-    for strategy, elements in [("Case containers", case_containers), 
-                              ("Specific tables", specific_tables), 
-                              ("All tables", all_tables)]:
-        print(f"Trying {strategy}...")
-        for element in elements:
-            rows = element.find_all('tr') if element.name == 'table' else element.find_all(['p', 'div'])
-            for row in rows:
-                cells = row.find_all(['td', 'th', 'span', 'div'])
-                if len(cells) >= 2:  # Reduced requirement
-                    text_content = [cell.get_text(strip=True) for cell in cells]
-                    # Look for case number patterns
-                    if any(text and ('/' in text or text.isdigit()) for text in text_content):
-                        case_data = {
-                            'court_type': 'High Court',
-                            'case_number': text_content[0] if text_content else '',
-                            'party_name': text_content[1] if len(text_content) > 1 else '',
-                            'date_of_listing': text_content[2] if len(text_content) > 2 else '',
-                            'scraped_at': datetime.now().isoformat(),
-                            'raw_data': text_content
-                        }
-                        cause_list.append(case_data)
+    # Classify case containers, specific tables and all tables in one pass;
+    # rows reachable through several strategies are only parsed once
+    strategy_counts = {}
+    for strategy, text_content in extract_candidate_rows(soup):
+        case = find_case_in_row(text_content)
+        if case:
+            case_data = make_case_data('High Court', text_content, case)
+            case_data['strategy'] = strategy
+            cause_list.append(case_data)
+            strategy_counts[strategy] = strategy_counts.get(strategy, 0) + 1
+    
+    for strategy, count in strategy_counts.items():
+        print(f"{strategy}: {count} rows")
+    
+    return cause_list
+
+def stream_scrape_high_court(session, backend=None):
+    """Table-row strategy of enhanced_scrape_high_court without building a soup
+    
+    Rows are parsed as the response streams in, so memory and CPU stay flat
+    for cause lists with thousands of rows.
+    """
+    url = "https://hcservices.ecourts.gov.in/hcservices/main.php"
+    cause_list = []
+    
+    try:
+        for text_content in stream_table_rows(session, url, backend=backend):
+            case = find_case_in_row(text_content) if len(text_content) >= 2 else None
+            if case:
+                cause_list.append(make_case_data('High Court', text_content, case))
+    except Exception as e:
+        print(f"Streaming error for {url}: {e}")
     
+    print(f"Streamed {len(cause_list)} rows")
     return cause_list
 
 def enhanced_scrape_district_court(session):
@@ -101,45 +111,37 @@ def enhanced_scrape_district_court(session):
     if not soup:
         return cause_list
     
-    # Similar enhanced strategies as high court
-    # Look for any element containing case-like data
-    all_elements = soup.find_all(['table', 'div', 'section'])
-    
-    for element in all_elements:
-        text = element.get_text(strip=True)
-        # Look for case number patterns in text
-        if any(pattern in text.lower() for pattern in ['case no', 'vs', 'petitioner', 'respondent']):
-            rows = element.find_all('tr') if element.name == 'table' else [element]
-            for row in rows:
-                cells = row.find_all(['td', 'th']) if row.name == 'tr' else [row]
-                if cells:
-                    text_content = [cell.get_text(strip=True) for cell in cells]
-                    case_data = {
-                        'court_type': 'District Court',
-                        'case_number': text_content[0] if text_content else '',
-                        'party_name': text_content[1] if len(text_content) > 1 else '',
-                        'date_of_listing': text_content[2] if len(text_content) > 2 else '',
-                        'scraped_at': datetime.now().isoformat(),
-                        'raw_data': text_content
-                    }
-                    cause_list.append(case_data)
+    # Mark every table/div/section whose text mentions a listing keyword by
+    # walking up once from each matching text node, instead of calling
+    # get_text() on every element (quadratic in document depth)
+    matched = set()
+    for string in soup.find_all(string=CAUSE_KEYWORDS_RE):
+        if type(string) is not NavigableString:
+            continue  # comments, scripts and styles are not part of get_text()
+        for parent in string.parents:
+            if id(parent) in matched:
+                break  # its ancestors were marked by an earlier string
+            if parent.name in ('table', 'div', 'section'):
+                matched.add(id(parent))
+    
+    for element in soup.find_all(['table', 'div', 'section']):
+        if id(element) not in matched:
+            continue
+        rows = element.find_all('tr') if element.name == 'table' else [element]
+        for row in rows:
+            cells = row.find_all(['td', 'th']) if row.name == 'tr' else [row]
+            if cells:
+                text_content = [cell.get_text(strip=True) for cell in cells]
+                cause_list.append(make_case_data('District Court', text_content,
+                                                 find_case_in_row(text_content)))
     
     return cause_list
 
 def get_enhanced_session():
-    """Enhanced session with better headers"""
-    session = requests.Session()
-    session.headers.update({
-        'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-        'Accept-Language': 'en-US,en;q=0.5',
-        'Accept-Encoding': 'gzip, deflate, br',
-        'Connection': 'keep-alive',
-        'Upgrade-Insecure-Requests': '1'
-    })
-    return session
+    """Enhanced session with better headers, shared with the main scraper's pool"""
+    return get_shared_session()
 
-def debug_scrape():
+def debug_scrape(streaming=False):
     """Debug version of main scrape function"""
     print("Starting DEBUG court cause list scraping...")
     
@@ -148,7 +150,7 @@ def debug_scrape():
     
     # Debug High Court
     print("\n=== DEBUGGING HIGH COURT ===")
-    hc_data = enhanced_scrape_high_court(session)
+    hc_data = stream_scrape_high_court(session) if streaming else enhanced_scrape_high_court(session)
     all_cause_lists.extend(hc_data)
     print(f"Found {len(hc_data)} entries from High Court")
     
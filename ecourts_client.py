@@ -0,0 +1,223 @@
+import json
+import requests
+from bs4 import BeautifulSoup
+from datetime import datetime
+
+# The High Court portal's JavaScript posts its forms to these endpoints and
+# renders the results client side (displayRecordsJson etc.); calling them directly
+# gives the same data without a browser
+HC_BASE_URL = "https://hcservices.ecourts.gov.in/hcservices/"
+INDEX_QRY_URL = HC_BASE_URL + "cases_qry/index_qry.php"
+BUSINESS_URL = HC_BASE_URL + "cases_qry/s_show_business.php"
+APPLICATION_URL = HC_BASE_URL + "cases_qry/s_show_app.php"
+CASE_HISTORY_URL = HC_BASE_URL + "cases_qry/o_civil_case_history.php"
+CAUSE_LIST_URL = HC_BASE_URL + "cases/cases.php"
+
+# Marker the portal embeds in error responses (searchForError in main.php)
+PORTAL_ERROR_MARKER = "ERROR_VAL"
+HIDDEN_PARTY_NAME = "XXXXXXX"
+
+def post_endpoint(session, url, data, timeout=15):
+    """POST a form to a portal endpoint, returning the response text or None on error"""
+    try:
+        response = session.post(url, data=data, timeout=timeout,
+                                headers={'X-Requested-With': 'XMLHttpRequest'})
+        response.raise_for_status()
+    except requests.RequestException as e:
+        print(f"Error calling {url}: {e}")
+        return None
+
+    text = response.text.strip()
+    if PORTAL_ERROR_MARKER in text or text[:5].upper() == 'ERROR':
+        print(f"Portal returned an error from {url}: {text[:200]}")
+        return None
+    return text
+
+def parse_json(text):
+    """Decode a JSON endpoint response, tolerating the portal's stray whitespace/BOM"""
+    try:
+        return json.loads(text.lstrip('\ufeff'))
+    except (TypeError, ValueError) as e:
+        print(f"Unexpected non-JSON response: {e}")
+        return None
+
+def fragment_text(html):
+    """Text of an HTML fragment, as shown in the portal's result divs"""
+    return BeautifulSoup(html, 'html.parser').get_text(' ', strip=True)
+
+def party_names(record, hide_all=False):
+    """Petitioner and respondent names, masked the same way the portal masks them"""
+    pet_hidden = hide_all or str(record.get('party_name1', '')).lower() == 'y'
+    res_hidden = hide_all or str(record.get('party_name2', '')).lower() == 'y'
+    petitioner = HIDDEN_PARTY_NAME if pet_hidden else (record.get('pet_name') or '')
+    respondent = HIDDEN_PARTY_NAME if res_hidden else (record.get('res_name') or '')
+    return petitioner, respondent
+
+def parse_case_records(data):
+    """Flatten a showRecords JSON payload into one dict per case
+
+    The payload groups cases by establishment: 'con' holds a JSON string of
+    records for each establishment, with matching 'courtNameArr', 'court_code'
+    and 'hide_partyname_estArr' entries.
+    """
+    if not data or not isinstance(data.get('con'), list):
+        return []
+
+    court_names = data.get('courtNameArr') or []
+    court_codes = data.get('court_code') or []
+    hidden_flags = data.get('hide_partyname_estArr') or []
+    records = []
+
+    for index, establishment in enumerate(data['con']):
+        if not establishment:
+            continue
+        rows = json.loads(establishment) if isinstance(establishment, str) else establishment
+        hide_all = index < len(hidden_flags) and str(hidden_flags[index]).lower() == 'y'
+
+        for row in rows:
+            petitioner, respondent = party_names(row, hide_all)
+            records.append({
+                'case_number': f"{row.get('type_name', '')}/{row.get('case_no2', '')}/{row.get('case_year', '')}",
+                'case_no': row.get('case_no', ''),
+                'cino': row.get('cino', ''),
+                'petitioner': petitioner,
+                'respondent': respondent,
+                'party_name': f"{petitioner} vs {respondent}" if respondent else petitioner,
+                'court_name': court_names[index] if index < len(court_names) else '',
+                'court_code': court_codes[index] if index < len(court_codes) else '',
+            })
+    return records
+
+def parse_label_values(html):
+    """Parse label/value table rows (e.g. 'Next Hearing Date | 12-10-2024') into a dict"""
+    soup = BeautifulSoup(html, 'html.parser')
+    details = {}
+    for row in soup.find_all('tr'):
+        cells = [cell.get_text(' ', strip=True) for cell in row.find_all(['td', 'th'])]
+        for label, value in zip(cells[0::2], cells[1::2]):
+            key = label.strip(' :').lower().replace(' ', '_')
+            if key and key not in details:
+                details[key] = value.lstrip(': ').strip()
+    return details
+
+def parse_cause_list(html, court_type='High Court', listing_date=''):
+    """Parse a cases.php cause list fragment into listings shaped like scraper output"""
+    soup = BeautifulSoup(html, 'html.parser')
+    listings = []
+    for row in soup.find_all('tr'):
+        cells = [cell.get_text(' ', strip=True) for cell in row.find_all('td')]
+        # Serial number, case number, parties, advocates...; headings use <th>
+        if len(cells) < 3 or not cells[0].rstrip('.').isdigit():
+            continue
+        listings.append({
+            'court_type': court_type,
+            'case_number': cells[1],
+            'party_name': cells[2],
+            'date_of_listing': listing_date,
+            'scraped_at': datetime.now().isoformat(),
+            'raw_data': cells
+        })
+    return listings
+
+def search_case_number(session, state_code, court_code, case_type_code, case_no, year, captcha=''):
+    """Search a case by registration number (index_qry.php, action showRecords)
+
+    court_code is the bench value from the portal's court_complex_code dropdown.
+    The portal validates a captcha tied to the session cookie; an empty or wrong
+    captcha comes back as 'Invalid Captcha' and yields no records.
+    """
+    data = {
+        'court_code': court_code,
+        'state_code': state_code,
+        'court_complex_code': str(court_code).split('@')[0],
+        'caseStatusSearchType': 'CScaseNumber',
+        'captcha': captcha,
+        'case_type': case_type_code,
+        'case_no': case_no,
+        'rgyear': year,
+        'caseNoType': 'new',
+        'displayOldCaseNo': 'NO',
+    }
+    text = post_endpoint(session, INDEX_QRY_URL + "?action_code=showRecords", data)
+    payload = parse_json(text) if text else None
+    if not payload:
+        return []
+    if payload.get('con') == 'Invalid Captcha':
+        print("Portal rejected the captcha for this session")
+        return []
+    return parse_case_records(payload)
+
+def fetch_case_history(session, state_code, court_code, case_no, cino):
+    """Fetch case history/status details for one case as a label/value dict"""
+    data = {
+        'court_code': court_code,
+        'state_code': state_code,
+        'court_complex_code': str(court_code).split('@')[0],
+        'case_no': case_no,
+        'cino': cino,
+        'appFlag': '',
+    }
+    text = post_endpoint(session, CASE_HISTORY_URL, data)
+    return parse_label_values(text) if text else {}
+
+def fetch_business(session, state_code, court_code, case_number, cino, business_date,
+                   next_date='', court_no='', national_court_code='', disposal_flag=''):
+    """Fetch the business (proceedings) recorded on one hearing date (s_show_business.php)"""
+    data = {
+        'court_code': court_code,
+        'dist_code': 1,
+        'nextdate1': next_date,
+        'case_number1': case_number,
+        'cino': cino,
+        'state_code': state_code,
+        'disposal_flag': disposal_flag,
+        'businessDate': business_date,
+        'national_court_code': national_court_code,
+        'court_no': court_no,
+        'court_code_post': court_code,
+        'filing_number': case_number,
+        'appFlag': '',
+    }
+    text = post_endpoint(session, BUSINESS_URL, data)
+    if not text:
+        return {}
+    details = parse_label_values(text)
+    details['text'] = fragment_text(text)
+    return details
+
+def fetch_application(session, state_code, court_code, case_number, app_cs_no, national_court_code=''):
+    """Fetch an interlocutory application's details (s_show_app.php)"""
+    data = {
+        'court_code': court_code,
+        'dist_code': 1,
+        'case_number1': case_number,
+        'state_code': state_code,
+        'court_complex_code': str(court_code).split('@')[0],
+        'national_court_code': national_court_code,
+        'app_cs_no': app_cs_no,
+        'appFlag': '',
+    }
+    text = post_endpoint(session, APPLICATION_URL, data)
+    return parse_label_values(text) if text else {}
+
+def fetch_cause_list(session, state_code, court_code, court_complex_code, court_no,
+                     causelist_date, criminal=False, captcha=''):
+    """Fetch one court's cause list for a date (cases/cases.php) as listings
+
+    causelist_date is dd-mm-yyyy, as in the portal's date picker.
+    """
+    data = {
+        'flag': 'cri_t' if criminal else 'civ_t',
+        'selprevdays': 1 if datetime.strptime(causelist_date, '%d-%m-%Y').date() < datetime.now().date() else 0,
+        'court_no': court_no,
+        'court_code': court_code,
+        'state_code': state_code,
+        'dist_code': 1,
+        'court_complex_code': str(court_complex_code).split('@')[0],
+        'causelist_date': causelist_date,
+        'caseStatusSearchType': 'CLcauselist',
+        'captcha': captcha,
+        'appFlag': '',
+    }
+    text = post_endpoint(session, CAUSE_LIST_URL, data)
+    return parse_cause_list(text, listing_date=causelist_date) if text else []
@@ -0,0 +1,140 @@
+import sqlite3
+import json
+import hashlib
+import time
+import requests
+from requests.structures import CaseInsensitiveDict
+
+CACHE_DATABASE = 'http_cache.db'
+DEFAULT_TTL = 6 * 60 * 60  # serve without revalidating for 6 hours
+MAX_CACHE_BYTES = 50 * 1024 * 1024
+
+# Headers that describe the wire transfer rather than the stored (decoded) body
+SKIPPED_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding', 'connection'}
+
+def get_cache_connection():
+    """Get cache database connection, creating the table on first use"""
+    conn = sqlite3.connect(CACHE_DATABASE, timeout=30)
+    conn.row_factory = sqlite3.Row
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS responses (
+            key TEXT PRIMARY KEY,
+            url TEXT NOT NULL,
+            etag TEXT,
+            last_modified TEXT,
+            headers TEXT NOT NULL,
+            body BLOB NOT NULL,
+            size INTEGER NOT NULL,
+            stored_at REAL NOT NULL,
+            last_access REAL NOT NULL
+        )
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses(last_access)')
+    return conn
+
+def cache_key(method, url, params=None, data=None):
+    """Key a response by method, URL and the sorted query/form parameters"""
+    parts = [method.upper(), url,
+             sorted((params or {}).items()),
+             sorted((data or {}).items())]
+    return hashlib.sha256(json.dumps(parts, default=str).encode('utf-8')).hexdigest()
+
+def build_response(entry, url):
+    """Turn a cached row back into a requests.Response the scrapers can use as usual"""
+    response = requests.Response()
+    response.status_code = 200
+    response.url = url
+    response._content = entry['body']
+    response.headers = CaseInsensitiveDict(json.loads(entry['headers']))
+    response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+    response.from_cache = True
+    return response
+
+def store_response(conn, key, url, response):
+    """Save a 200 response body with its validators"""
+    headers = {k: v for k, v in response.headers.items() if k.lower() not in SKIPPED_HEADERS}
+    body = response.content
+    now = time.time()
+    conn.execute('''
+        INSERT OR REPLACE INTO responses
+            (key, url, etag, last_modified, headers, body, size, stored_at, last_access)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', (key, url, response.headers.get('ETag'), response.headers.get('Last-Modified'),
+          json.dumps(headers), body, len(body), now, now))
+
+def evict(conn, max_bytes=None):
+    """Drop least recently used responses until the cache fits in max_bytes"""
+    if max_bytes is None:
+        max_bytes = MAX_CACHE_BYTES
+    total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+    if total <= max_bytes:
+        return
+    stale_keys = []
+    for row in conn.execute('SELECT key, size FROM responses ORDER BY last_access'):
+        if total <= max_bytes:
+            break
+        stale_keys.append((row['key'],))
+        total -= row['size']
+    conn.executemany('DELETE FROM responses WHERE key = ?', stale_keys)
+
+def cached_request(session, method, url, params=None, data=None, ttl=DEFAULT_TTL, timeout=10):
+    """Fetch url through the on-disk cache
+
+    Fresh entries (younger than ttl) are served without a request. Older entries
+    are revalidated with If-None-Match / If-Modified-Since so an unchanged page
+    costs a 304 instead of a full download.
+    """
+    key = cache_key(method, url, params, data)
+    conn = get_cache_connection()
+    try:
+        entry = conn.execute('SELECT * FROM responses WHERE key = ?', (key,)).fetchone()
+        now = time.time()
+
+        if entry and now - entry['stored_at'] < ttl:
+            conn.execute('UPDATE responses SET last_access = ? WHERE key = ?', (now, key))
+            conn.commit()
+            return build_response(entry, url)
+
+        headers = {}
+        if entry and entry['etag']:
+            headers['If-None-Match'] = entry['etag']
+        if entry and entry['last_modified']:
+            headers['If-Modified-Since'] = entry['last_modified']
+
+        response = session.request(method, url, params=params, data=data,
+                                   headers=headers, timeout=timeout)
+
+        if response.status_code == 304 and entry:
+            conn.execute('''
+                UPDATE responses SET stored_at = ?, last_access = ?,
+                    etag = COALESCE(?, etag), last_modified = COALESCE(?, last_modified)
+                WHERE key = ?
+            ''', (now, now, response.headers.get('ETag'), response.headers.get('Last-Modified'), key))
+            conn.commit()
+            return build_response(entry, url)
+
+        cache_control = response.headers.get('Cache-Control', '').lower()
+        if response.status_code == 200 and 'no-store' not in cache_control:
+            store_response(conn, key, url, response)
+            evict(conn)
+            conn.commit()
+
+        response.from_cache = False
+        return response
+    finally:
+        conn.close()
+
+def cached_get(session, url, params=None, ttl=DEFAULT_TTL, timeout=10):
+    """GET url through the response cache"""
+    return cached_request(session, 'GET', url, params=params, ttl=ttl, timeout=timeout)
+
+def cached_post(session, url, data=None, ttl=DEFAULT_TTL, timeout=10):
+    """POST a form through the response cache, keyed by its form fields"""
+    return cached_request(session, 'POST', url, data=data, ttl=ttl, timeout=timeout)
+
+def clear_cache():
+    """Remove every cached response"""
+    conn = get_cache_connection()
+    conn.execute('DELETE FROM responses')
+    conn.commit()
+    conn.close()
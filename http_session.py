@@ -0,0 +1,56 @@
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Accept-Encoding': 'gzip, deflate, br',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1'
+}
+
+# Number of distinct hosts kept in the pool and open connections allowed per host
+POOL_HOSTS = 10
+MAX_CONNECTIONS_PER_HOST = 4
+MAX_RETRIES = Retry(total=2, connect=2, read=1, backoff_factor=0.5,
+                    status_forcelist=(502, 503, 504))
+
+_session = None
+_session_lock = threading.Lock()
+
+def build_session(headers=None):
+    """Create a session with browser headers and a sized keep-alive connection pool"""
+    session = requests.Session()
+    session.headers.update(DEFAULT_HEADERS)
+    if headers:
+        session.headers.update(headers)
+
+    # pool_block keeps us at MAX_CONNECTIONS_PER_HOST instead of opening extra
+    # throwaway connections when every pooled one is busy
+    adapter = HTTPAdapter(pool_connections=POOL_HOSTS,
+                          pool_maxsize=MAX_CONNECTIONS_PER_HOST,
+                          pool_block=True,
+                          max_retries=MAX_RETRIES)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+def get_shared_session():
+    """Return the process-wide session so TLS connections are reused across lookups"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = build_session()
+    return _session
+
+def close_shared_session():
+    """Close pooled connections, e.g. at the end of a CLI run"""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
@@ -0,0 +1,176 @@
+import json
+import threading
+import time
+from database import get_db_connection, release_db_connection
+
+JOB_WORKERS = 4  # scrapes run concurrently in the web process
+JOB_POLL_INTERVAL = 1.0  # seconds an idle worker waits before checking the queue again
+JOB_STALE_AFTER = 10 * 60  # seconds a job may stay running before its worker is presumed dead
+JOB_ERROR_BACKOFF = (1.0, 30.0)  # first and longest wait after a database error
+
+# Jobs in these states will not change any more
+FINISHED_STATUSES = ('done', 'failed')
+
+def init_jobs():
+    """Create the job queue table"""
+    conn = get_db_connection()
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            kind TEXT NOT NULL,
+            params TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'queued',
+            result TEXT,
+            error TEXT,
+            created_at REAL NOT NULL,
+            started_at REAL,
+            finished_at REAL
+        )
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status, id)')
+    conn.commit()
+
+def enqueue_job(kind, params):
+    """Queue a job and return its id"""
+    conn = get_db_connection()
+    cursor = conn.execute('INSERT INTO jobs (kind, params, created_at) VALUES (?, ?, ?)',
+                          (kind, json.dumps(params), time.time()))
+    conn.commit()
+    return cursor.lastrowid
+
+def claim_job():
+    """Mark the oldest queued job as running and return it, or None if the queue is empty
+
+    The select and update happen in one statement, so two workers (or two
+    processes) can never claim the same job.
+    """
+    conn = get_db_connection()
+    row = conn.execute('''
+        UPDATE jobs SET status = 'running', started_at = ?
+        WHERE id = (SELECT id FROM jobs WHERE status = 'queued' ORDER BY id LIMIT 1)
+        RETURNING id, kind, params
+    ''', (time.time(),)).fetchone()
+    conn.commit()
+    if not row:
+        return None
+    return {'id': row['id'], 'kind': row['kind'], 'params': json.loads(row['params'])}
+
+def finish_job(job_id, result=None, error=None):
+    """Record a job's result, or its error message if it failed"""
+    conn = get_db_connection()
+    conn.execute('UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ? WHERE id = ?',
+                 ('failed' if error is not None else 'done', json.dumps(result), error, time.time(), job_id))
+    conn.commit()
+
+def get_job(job_id):
+    """A job's status, result and error as a dict, or None if there is no such job"""
+    conn = get_db_connection()
+    row = conn.execute('SELECT id, kind, status, result, error, created_at, started_at, finished_at '
+                       'FROM jobs WHERE id = ?', (job_id,)).fetchone()
+    if not row:
+        return None
+    job = dict(row)
+    job['result'] = json.loads(job['result']) if job['result'] else None
+    return job
+
+def requeue_stale_jobs(stale_after=JOB_STALE_AFTER):
+    """Put jobs left running by a stopped process back on the queue
+
+    Only jobs started more than stale_after seconds ago are requeued, so jobs
+    that another live process (or the reloader's twin) is running are left alone.
+    """
+    conn = get_db_connection()
+    count = conn.execute("UPDATE jobs SET status = 'queued', started_at = NULL "
+                         "WHERE status = 'running' AND started_at < ?",
+                         (time.time() - stale_after,)).rowcount
+    conn.commit()
+    if count:
+        print(f"Requeued {count} interrupted jobs")
+    return count
+
+class JobWorkerPool:
+    """Threads that take jobs off the SQLite queue and run the handler for their kind
+
+    handlers maps a job kind to a function called with the job's params; its
+    return value is stored as the job result, and an exception fails the job.
+    """
+
+    def __init__(self, handlers, workers=JOB_WORKERS, poll_interval=JOB_POLL_INTERVAL):
+        self.handlers = handlers
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.wakeup = threading.Event()
+        self.stopping = threading.Event()
+        self.threads = []
+        self.next_stale_check = 0  # when an idle worker next looks for stale jobs
+
+    def start(self):
+        """Start the worker threads"""
+        init_jobs()
+        for number in range(self.workers):
+            thread = threading.Thread(target=self.run, name=f"job-worker-{number}", daemon=True)
+            thread.start()
+            self.threads.append(thread)
+
+    def stop(self, timeout=None):
+        """Ask the workers to exit after their current job and wait for them"""
+        self.stopping.set()
+        self.wakeup.set()
+        for thread in self.threads:
+            thread.join(timeout)
+        self.threads = []
+
+    def submit(self, kind, params):
+        """Queue a job and wake an idle worker; returns the job id"""
+        job_id = enqueue_job(kind, params)
+        self.wakeup.set()
+        return job_id
+
+    def run(self):
+        """Worker loop: claim and run jobs until stopped
+
+        Errors outside a handler (e.g. the database still locked after the busy
+        timeout) are logged and retried with a growing delay instead of ending
+        the thread; a job they left marked running is requeued once it goes stale.
+        """
+        backoff = JOB_ERROR_BACKOFF[0]
+        try:
+            while not self.stopping.is_set():
+                try:
+                    job = claim_job()
+                    if job:
+                        self.run_job(job)
+                    elif time.time() >= self.next_stale_check:
+                        self.next_stale_check = time.time() + JOB_STALE_AFTER / 2
+                        requeue_stale_jobs()
+                except Exception as e:
+                    print(f"Job worker error, retrying in {backoff:.0f}s: {e}")
+                    release_db_connection()
+                    self.stopping.wait(backoff)
+                    backoff = min(backoff * 2, JOB_ERROR_BACKOFF[1])
+                    continue
+                backoff = JOB_ERROR_BACKOFF[0]
+                # Roll back whatever a failed handler left open before the next job
+                release_db_connection()
+                if not job:
+                    # Jobs queued by another process are picked up on the next poll
+                    self.wakeup.wait(self.poll_interval)
+                    self.wakeup.clear()
+        finally:
+            release_db_connection()
+
+    def run_job(self, job):
+        """Run one claimed job and record how it ended"""
+        handler = self.handlers.get(job['kind'])
+        if handler is None:
+            finish_job(job['id'], error=f"Unknown job kind: {job['kind']}")
+            return
+        try:
+            result = handler(**job['params'])
+        except Exception as e:
+            # An exception without a message still has to read as a failure
+            error = str(e) or type(e).__name__
+            print(f"Job {job['id']} ({job['kind']}) failed: {error}")
+            finish_job(job['id'], error=error)
+        else:
+            finish_job(job['id'], result=result)
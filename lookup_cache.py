@@ -0,0 +1,177 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from database import get_db_connection, release_db_connection, case_key
+
+LOOKUP_TTL = 15 * 60  # serve a cached lookup without refreshing for 15 minutes
+LOOKUP_STALE_TTL = 24 * 60 * 60  # after that, serve it while refreshing for up to a day
+MEMORY_CACHE_SIZE = 256  # lookups kept in memory per process
+
+def init_lookup_cache():
+    """Create the persistent lookup cache table"""
+    conn = get_db_connection()
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS lookup_cache (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL,
+            fetched_at REAL NOT NULL
+        )
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_lookup_cache_fetched_at ON lookup_cache(fetched_at)')
+    conn.commit()
+
+def lookup_key(case_type, case_number, year, court=None):
+    """Cache key for a case, however its number was typed, at the court it was looked up in"""
+    case_number_norm, year = case_key(case_number, year)
+    return json.dumps([(case_type or '').strip(), case_number_norm, year, court or None], sort_keys=True)
+
+def is_cacheable(result):
+    """Only real portal results are cached; sample data and failures are not"""
+    return bool(result) and 'note' not in result
+
+class SingleFlight:
+    """Run one call per key at a time; concurrent callers with the same key share its outcome"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = {}  # key -> [done event, result, exception]
+
+    def do(self, key, fn, *args):
+        """Result of fn(*args), joining a call already in flight for key"""
+        with self.lock:
+            call = self.calls.get(key)
+            leader = call is None
+            if leader:
+                call = self.calls[key] = [threading.Event(), None, None]
+
+        if not leader:
+            call[0].wait()
+        else:
+            try:
+                call[1] = fn(*args)
+            except Exception as e:
+                call[2] = e
+            finally:
+                with self.lock:
+                    del self.calls[key]
+                call[0].set()
+
+        if call[2] is not None:
+            raise call[2]
+        return call[1]
+
+class LookupCache:
+    """Two-tier (memory LRU + SQLite) cache in front of a case lookup function
+
+    Fresh entries are returned as is. Entries past ttl but within stale_ttl are
+    returned immediately while a background thread refreshes them; older or
+    missing entries are fetched before returning.
+
+    fetch is called as fetch(case_type, case_number, year, court=court), like
+    scraper.scrape_case_by_number. Only real portal results are cached, so
+    lookups without a court (which get sample data) always call fetch.
+    """
+
+    def __init__(self, fetch, ttl=LOOKUP_TTL, stale_ttl=LOOKUP_STALE_TTL,
+                 max_entries=MEMORY_CACHE_SIZE):
+        self.fetch = fetch
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self.entries = OrderedDict()  # key -> (value, fetched_at), least recent first
+        self.refreshing = set()
+        self.in_flight = SingleFlight()
+        self.lock = threading.Lock()
+        init_lookup_cache()
+
+    def get(self, case_type, case_number, year, court=None):
+        """Cached result of fetch(case_type, case_number, year, court=court)"""
+        key = lookup_key(case_type, case_number, year, court)
+        entry = self.load(key)
+        if entry:
+            value, fetched_at = entry
+            age = time.time() - fetched_at
+            if age < self.ttl:
+                return dict(value)
+            if age < self.stale_ttl:
+                self.refresh_in_background(key, case_type, case_number, year, court)
+                return dict(value)
+        return self.refresh(key, case_type, case_number, year, court)
+
+    def load(self, key):
+        """(value, fetched_at) from memory, falling back to SQLite, or None"""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry:
+                self.entries.move_to_end(key)
+                return entry
+        row = get_db_connection().execute(
+            'SELECT value, fetched_at FROM lookup_cache WHERE key = ?', (key,)).fetchone()
+        if not row:
+            return None
+        entry = (json.loads(row['value']), row['fetched_at'])
+        self.remember(key, entry)
+        return entry
+
+    def remember(self, key, entry):
+        """Put an entry in the memory tier, evicting the least recently used"""
+        with self.lock:
+            self.entries[key] = entry
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def store(self, key, value):
+        """Save a fetched result in both tiers, expiring rows too old to serve"""
+        now = time.time()
+        self.remember(key, (value, now))
+        conn = get_db_connection()
+        conn.execute('INSERT OR REPLACE INTO lookup_cache (key, value, fetched_at) VALUES (?, ?, ?)',
+                     (key, json.dumps(value, ensure_ascii=False), now))
+        conn.execute('DELETE FROM lookup_cache WHERE fetched_at < ?', (now - self.stale_ttl,))
+        conn.commit()
+
+    def refresh(self, key, case_type, case_number, year, court=None):
+        """Fetch a case now and cache the result if it is a real one
+
+        Concurrent refreshes of the same case (misses and background refreshes
+        alike) share a single fetch to the portal.
+        """
+        result = self.in_flight.do(key, self.fetch_and_store, key, case_type, case_number, year, court)
+        return dict(result) if result else result
+
+    def fetch_and_store(self, key, case_type, case_number, year, court=None):
+        """Fetch a case and cache the result if it is a real one"""
+        result = self.fetch(case_type, case_number, year, court=court)
+        if is_cacheable(result):
+            self.store(key, result)
+        return result
+
+    def refresh_in_background(self, key, case_type, case_number, year, court=None):
+        """Start refreshing a stale entry unless a refresh is already running"""
+        with self.lock:
+            if key in self.refreshing:
+                return
+            self.refreshing.add(key)
+
+        def run():
+            try:
+                self.refresh(key, case_type, case_number, year, court)
+            except Exception as e:
+                print(f"Background refresh failed for {case_number}/{year}: {e}")
+            finally:
+                release_db_connection()
+                with self.lock:
+                    self.refreshing.discard(key)
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def invalidate(self, case_type, case_number, year, court=None):
+        """Drop a case from both tiers"""
+        key = lookup_key(case_type, case_number, year, court)
+        with self.lock:
+            self.entries.pop(key, None)
+        conn = get_db_connection()
+        conn.execute('DELETE FROM lookup_cache WHERE key = ?', (key,))
+        conn.commit()
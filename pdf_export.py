@@ -0,0 +1,115 @@
+import argparse
+import os
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from fpdf import FPDF
+from database import init_db, get_query, search_queries, MAX_PAGE_SIZE
+from pdf_generator import render_case_pdf, draw_case, write_atomic
+
+# Documents handed to a worker process at a time; amortizes pickling overhead
+EXPORT_CHUNK_SIZE = 8
+
+def render_export(query_data):
+    """Worker: render one case PDF, returning (query id, PDF bytes, seconds taken)"""
+    started = time.perf_counter()
+    data = render_case_pdf(query_data)
+    return query_data['id'], data, time.perf_counter() - started
+
+def load_queries(query_ids):
+    """Saved queries as plain dicts (picklable for the worker processes), skipping unknown ids"""
+    queries = []
+    for query_id in query_ids:
+        query = get_query(query_id)
+        if query:
+            queries.append(dict(query))
+        else:
+            print(f"Query {query_id} not found - skipped")
+    return queries
+
+def all_query_ids():
+    """Ids of every saved query, newest first"""
+    query_ids, cursor = [], None
+    while True:
+        queries, cursor = search_queries(limit=MAX_PAGE_SIZE, before=cursor)
+        query_ids.extend(query['id'] for query in queries)
+        if not cursor:
+            return query_ids
+
+def export_zip(queries, filename, workers=None):
+    """Render case PDFs across worker processes into a zip; returns per-document timings"""
+    timings = []
+    tmp_path = filename + '.tmp'
+    with zipfile.ZipFile(tmp_path, 'w', zipfile.ZIP_DEFLATED) as archive:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for query_id, data, seconds in executor.map(render_export, queries,
+                                                        chunksize=EXPORT_CHUNK_SIZE):
+                archive.writestr(f"case_{query_id}.pdf", data)
+                timings.append((query_id, seconds))
+    os.replace(tmp_path, filename)
+    return timings
+
+def export_merged(queries, filename):
+    """Render all cases into one PDF, one or more pages per case
+
+    A single FPDF document can only be built in one process, so merged
+    exports render sequentially. Returns the per-document drawing timings and
+    the seconds spent in pdf.output(), where fpdf2 subsets the fonts and
+    compresses every page of the document.
+    """
+    timings = []
+    pdf = FPDF()
+    for query in queries:
+        started = time.perf_counter()
+        draw_case(pdf, query)
+        timings.append((query['id'], time.perf_counter() - started))
+    started = time.perf_counter()
+    data = bytes(pdf.output())
+    output_time = time.perf_counter() - started
+    write_atomic(filename, data)
+    return timings, output_time
+
+def export_pdfs(query_ids, filename, merge=False, workers=None):
+    """Export the PDFs of many saved queries to a zip (or one merged PDF) and print timings"""
+    queries = load_queries(query_ids)
+    if not queries:
+        print("No queries to export")
+        return []
+
+    started = time.perf_counter()
+    if merge:
+        timings, output_time = export_merged(queries, filename)
+        print("Drawing time per case (the whole PDF is written once at the end):")
+    else:
+        timings = export_zip(queries, filename, workers)
+    elapsed = time.perf_counter() - started
+
+    for query_id, seconds in timings:
+        print(f"case_{query_id}.pdf: {seconds * 1000:.1f} ms")
+    render_time = sum(seconds for _, seconds in timings)
+    if merge:
+        summary = f"{render_time:.2f}s drawing pages, {output_time:.2f}s writing the PDF"
+    else:
+        summary = f"{render_time:.2f}s of rendering, {render_time / elapsed:.1f}x parallel"
+    print(f"\nExported {len(timings)} PDFs to {filename} in {elapsed:.2f}s ({summary})")
+    return timings
+
+def main():
+    """Command line batch export of saved query PDFs"""
+    parser = argparse.ArgumentParser(description="Export case PDFs for saved queries")
+    parser.add_argument('query_ids', nargs='*', type=int, help="ids of saved queries to export")
+    parser.add_argument('--all', action='store_true', help="export every saved query")
+    parser.add_argument('-o', '--output', help="output file (default: cases.zip, or cases.pdf with --merge)")
+    parser.add_argument('--merge', action='store_true', help="write one combined PDF instead of a zip")
+    parser.add_argument('--workers', type=int, help="worker processes (default: one per CPU)")
+    args = parser.parse_args()
+
+    init_db()
+    query_ids = all_query_ids() if args.all else args.query_ids
+    if not query_ids:
+        parser.error("give query ids or --all")
+    output = args.output or ('cases.pdf' if args.merge else 'cases.zip')
+    export_pdfs(query_ids, output, merge=args.merge, workers=args.workers)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+import copy
+import io
+import os
+import threading
+from fpdf import FPDF, FPDF_VERSION
+from fpdf.enums import TextEmphasis
+from fpdf.fonts import TTFFont, SubsetMap
+from fontTools import ttLib
+
+# Family name the PDFs use for the Unicode font, and the core font used when
+# no TTF font is installed (core fonts only cover Latin-1)
+FONT_FAMILY = 'casefont'
+CORE_FONT_FAMILY = 'Arial'
+
+# PDF_FONT_PATH / PDF_FONT_BOLD_PATH pick the main font; PDF_FALLBACK_FONTS is a
+# os.pathsep-separated list of fonts for scripts the main font lacks
+FONT_PATH_ENV = 'PDF_FONT_PATH'
+BOLD_FONT_PATH_ENV = 'PDF_FONT_BOLD_PATH'
+FALLBACK_FONTS_ENV = 'PDF_FALLBACK_FONTS'
+
+FONT_DIRS = (
+    '/usr/share/fonts',
+    '/usr/local/share/fonts',
+    os.path.expanduser('~/.fonts'),
+    os.path.expanduser('~/.local/share/fonts'),
+    '/Library/Fonts',
+    '/System/Library/Fonts/Supplemental',
+    'C:/Windows/Fonts',
+)
+
+# (regular, bold) main font candidates, best Latin + Devanagari coverage first
+FONT_CANDIDATES = (
+    ('NotoSans-Regular.ttf', 'NotoSans-Bold.ttf'),
+    ('FreeSans.ttf', 'FreeSansBold.ttf'),
+    ('DejaVuSans.ttf', 'DejaVuSans-Bold.ttf'),
+    ('LiberationSans-Regular.ttf', 'LiberationSans-Bold.ttf'),
+    ('Arial Unicode.ttf', None),
+    ('arial.ttf', 'arialbd.ttf'),
+)
+
+# Fonts for Indian scripts, used for characters the main font has no glyph for
+FALLBACK_CANDIDATES = (
+    'NotoSansDevanagari-Regular.ttf', 'Lohit-Devanagari.ttf', 'Mangal.ttf', 'mangal.ttf',
+    'NotoSansBengali-Regular.ttf', 'Lohit-Bengali.ttf',
+    'NotoSansGujarati-Regular.ttf', 'Lohit-Gujarati.ttf',
+    'NotoSansGurmukhi-Regular.ttf', 'Lohit-Gurmukhi.ttf',
+    'NotoSansKannada-Regular.ttf', 'Lohit-Kannada.ttf',
+    'NotoSansMalayalam-Regular.ttf', 'Lohit-Malayalam.ttf',
+    'NotoSansOriya-Regular.ttf', 'Lohit-Odia.ttf',
+    'NotoSansTamil-Regular.ttf', 'Lohit-Tamil.ttf',
+    'NotoSansTelugu-Regular.ttf', 'Lohit-Telugu.ttf',
+)
+
+# fpdf2 releases install_font() has been checked against. It builds fonts from
+# fpdf2 internals (the TTFFont constructor, SubsetMap and the i, fontkey and
+# desc attributes), so other releases use the public add_font() instead.
+TESTED_FPDF_VERSIONS = ('2.7.6',)
+CACHED_FONT_INSTALL = FPDF_VERSION in TESTED_FPDF_VERSIONS
+
+_lock = threading.Lock()
+_font_set = None  # (regular, bold, fallbacks) paths once resolved; () if none found
+_prototypes = {}  # font path -> (parsed TTFFont, file bytes)
+_cmaps = {}  # font path -> code points the font has glyphs for
+
+def index_font_files():
+    """Map of lower-cased file name to path for every TTF font in FONT_DIRS"""
+    files = {}
+    for font_dir in FONT_DIRS:
+        for root, _, names in os.walk(font_dir):
+            for name in names:
+                if name.lower().endswith('.ttf'):
+                    files.setdefault(name.lower(), os.path.join(root, name))
+    return files
+
+def resolve_fonts():
+    """(regular, bold, fallbacks) font paths from the environment or the system, or ()"""
+    regular = os.environ.get(FONT_PATH_ENV)
+    bold = os.environ.get(BOLD_FONT_PATH_ENV)
+    fallbacks = [path for path in os.environ.get(FALLBACK_FONTS_ENV, '').split(os.pathsep) if path]
+
+    files = None
+    if not regular or not fallbacks:
+        files = index_font_files()
+    if not regular:
+        for regular_name, bold_name in FONT_CANDIDATES:
+            if regular_name.lower() in files:
+                regular = files[regular_name.lower()]
+                bold = bold or files.get((bold_name or '').lower())
+                break
+    if not regular:
+        print("No Unicode TTF font found - PDFs fall back to Arial (Latin-1 only)")
+        return ()
+    if not fallbacks:
+        fallbacks = [files[name.lower()] for name in FALLBACK_CANDIDATES if name.lower() in files]
+    return regular, bold, fallbacks
+
+def get_font_set():
+    """The resolved font paths, looked up once per process"""
+    global _font_set
+    with _lock:
+        if _font_set is None:
+            _font_set = resolve_fonts()
+        return _font_set
+
+def font_signature():
+    """Names of the fonts in use, for keying cached PDFs"""
+    fonts = get_font_set()
+    if not fonts:
+        return CORE_FONT_FAMILY
+    regular, bold, fallbacks = fonts
+    return '|'.join(os.path.basename(path) for path in (regular, bold or '', *fallbacks))
+
+def get_prototype(path):
+    """Parsed TTF font and its bytes, parsed on first use and then kept for the process"""
+    with _lock:
+        prototype = _prototypes.get(path)
+        if prototype is None:
+            with open(path, 'rb') as f:
+                data = f.read()
+            prototype = _prototypes[path] = (TTFFont(FPDF(), path, 'prototype', ''), data)
+        return prototype
+
+def font_cmap(path):
+    """Code points a font has glyphs for, read once per process"""
+    with _lock:
+        cmap = _cmaps.get(path)
+        if cmap is None:
+            cmap = _cmaps[path] = frozenset(ttLib.TTFont(path, lazy=True).getBestCmap())
+        return cmap
+
+def install_font(pdf, family, style, path):
+    """Add a TTF font to pdf, reusing the metrics parsed for earlier documents
+
+    Only what fpdf2's TTFFont() parses (cmap, glyph widths, font metrics) is
+    cached. Each document still loads its own fontTools object from the cached
+    bytes and gets its own glyph subset and font descriptor, because fpdf2
+    subsets the font in place and numbers the descriptor when the PDF is
+    written; that subsetting is most of the font cost that remains per
+    document. On fpdf2 releases outside TESTED_FPDF_VERSIONS the font is added
+    with add_font(), which parses the file each time.
+    """
+    fontkey = f"{family.lower()}{style}"
+    if fontkey in pdf.fonts:
+        return
+    if not CACHED_FONT_INSTALL:
+        pdf.add_font(family, style, path)
+        return
+    prototype, data = get_prototype(path)
+    font = copy.copy(prototype)
+    font.i = len(pdf.fonts) + 1
+    font.fontkey = fontkey
+    font.emphasis = TextEmphasis.coerce(style)
+    # The descriptor becomes a PDF object of this document when it is written
+    font.desc = copy.copy(prototype.desc)
+    font.ttfont = ttLib.TTFont(io.BytesIO(data), recalcTimestamp=False, fontNumber=0, lazy=True)
+    font.missing_glyphs = []
+    # Same reserved characters fpdf2's add_font() maps for page number aliases
+    reserved = "\x00 \r\n"
+    if pdf.str_alias_nb_pages:
+        reserved += "0123456789" + pdf.str_alias_nb_pages
+    font.subset = SubsetMap(font, [ord(char) for char in reserved])
+    pdf.fonts[fontkey] = font
+
+def setup_fonts(pdf):
+    """Install the Unicode font on a document and return the family to draw with
+
+    Call after alias_nb_pages(); calling it again on the same document is
+    cheap. Returns CORE_FONT_FAMILY when no TTF font is available.
+    """
+    fonts = get_font_set()
+    if not fonts:
+        return CORE_FONT_FAMILY
+    regular, bold, _ = fonts
+    install_font(pdf, FONT_FAMILY, '', regular)
+    install_font(pdf, FONT_FAMILY, 'B', bold or regular)
+    return FONT_FAMILY
+
+def install_fallbacks(pdf, missing):
+    """Install the fallback fonts that have glyphs for the missing code points"""
+    _, _, fallbacks = get_font_set()
+    added = False
+    for number, path in enumerate(fallbacks):
+        family = f"fallback{number}"
+        covered = missing & font_cmap(path)
+        if covered and family not in pdf.fonts:
+            install_font(pdf, family, '', path)
+            added = True
+        missing -= covered
+        if not missing:
+            break
+    if added:
+        pdf.set_fallback_fonts([key for key in pdf.fonts if key.startswith('fallback')],
+                               exact_match=False)
+
+def pdf_text(pdf, text):
+    """Text ready to draw on pdf
+
+    With the Unicode font, fallback fonts are added for scripts it lacks (only
+    when needed, since fpdf2 embeds every font added to a document). With core
+    fonts, text is reduced to Latin-1.
+    """
+    text = str(text if text is not None else '')
+    if FONT_FAMILY not in pdf.fonts:
+        return text.encode('latin-1', 'replace').decode('latin-1')
+    if not text.isascii():
+        missing = {ord(char) for char in text} - font_cmap(get_font_set()[0])
+        if missing:
+            install_fallbacks(pdf, missing)
+    return text
@@ -1,44 +1,270 @@
 from fpdf import FPDF
+import hashlib
 import json
 import os
-from datetime import datetime
+import tempfile
+from datetime import datetime, timedelta
+from itertools import groupby
+from cause_list_store import ensure_cause_list_store, iter_listings
+from pdf_fonts import setup_fonts, font_signature, pdf_text
 
-def generate_case_pdf(query_data):
-    """Generate PDF for case data"""
+# Bump whenever the layout below changes so cached PDFs are rebuilt
+PDF_TEMPLATE_VERSION = 2
+PDF_CACHE_DIR = 'pdf_cache'
+MAX_PDF_CACHE_BYTES = 100 * 1024 * 1024
+# Keep rendered PDFs on disk between requests; set PDF_DISK_CACHE=0 where the
+# filesystem is slower than rendering (e.g. overlayfs in containers)
+PDF_DISK_CACHE = os.environ.get('PDF_DISK_CACHE', '1') != '0'
+
+# Mode for written PDFs: what open() would give (0666 less the umask), since
+# mkstemp creates files 0600. The umask can only be read by setting it, so
+# this is done once at import rather than per write from several threads.
+_umask = os.umask(0)
+os.umask(_umask)
+PDF_FILE_MODE = 0o666 & ~_umask
+
+# Cause list report columns: (heading, listing field, width in mm)
+REPORT_COLUMNS = (
+    ('#', None, 12),
+    ('Case Number', 'case_number', 48),
+    ('Party Name', 'party_name', 100),
+    ('Listed On', 'date_of_listing', 30),
+)
+REPORT_ORDER = 'listing_date, court_type, bench, case_number_norm, id'
+
+def render_case_pdf(query_data):
+    """Render the PDF for case data in memory and return its bytes"""
     pdf = FPDF()
+    draw_case(pdf, query_data)
+    return bytes(pdf.output())
+
+def draw_case(pdf, query_data):
+    """Lay out one case's details on a new page of pdf"""
+    family = setup_fonts(pdf)
     pdf.add_page()
-    pdf.set_font('Arial', 'B', 16)
+    pdf.set_font(family, 'B', 16)
     
     # Title
     pdf.cell(0, 10, 'Court Case Details', 0, 1, 'C')
     pdf.ln(10)
     
     # Query details
-    pdf.set_font('Arial', 'B', 12)
-    pdf.cell(0, 8, f"Case Type: {query_data['case_type']}", 0, 1)
-    pdf.cell(0, 8, f"Case Number: {query_data['case_number']}", 0, 1)
-    pdf.cell(0, 8, f"Year: {query_data['year']}", 0, 1)
-    pdf.cell(0, 8, f"Query Date: {query_data['created_at']}", 0, 1)
+    pdf.set_font(family, 'B', 12)
+    pdf.cell(0, 8, pdf_text(pdf, f"Case Type: {query_data['case_type']}"), 0, 1)
+    pdf.cell(0, 8, pdf_text(pdf, f"Case Number: {query_data['case_number']}"), 0, 1)
+    pdf.cell(0, 8, pdf_text(pdf, f"Year: {query_data['year']}"), 0, 1)
+    pdf.cell(0, 8, pdf_text(pdf, f"Query Date: {query_data['created_at']}"), 0, 1)
     pdf.ln(5)
     
     # Case data
-    pdf.set_font('Arial', 'B', 14)
+    pdf.set_font(family, 'B', 14)
     pdf.cell(0, 8, 'Case Information:', 0, 1)
-    pdf.set_font('Arial', '', 10)
+    pdf.set_font(family, '', 10)
     
     case_data = query_data['response_data']
     if isinstance(case_data, dict):
         for key, value in case_data.items():
-            pdf.cell(0, 6, f"{key.replace('_', ' ').title()}: {value}", 0, 1)
+            pdf.cell(0, 6, pdf_text(pdf, f"{key.replace('_', ' ').title()}: {value}"), 0, 1)
     else:
-        pdf.cell(0, 6, str(case_data), 0, 1)
+        pdf.cell(0, 6, pdf_text(pdf, case_data), 0, 1)
+
+def write_atomic(path, data):
+    """Write a file via a temporary file and rename, so readers never see it half written"""
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.chmod(tmp_path, PDF_FILE_MODE)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+def generate_case_pdf(query_data, pdf_path=None):
+    """Generate PDF for case data, by default at static/case_<id>.pdf"""
+    if pdf_path is None:
+        pdf_filename = f"case_{query_data['id']}.pdf"
+        pdf_path = os.path.join('static', pdf_filename)
     
-    # Save PDF
-    pdf_filename = f"case_{query_data['id']}.pdf"
-    pdf_path = os.path.join('static', pdf_filename)
+    write_atomic(pdf_path, render_case_pdf(query_data))
+    return pdf_path
+
+def pdf_cache_key(query_data):
+    """Hash of everything a case PDF shows, plus the template version"""
+    content = {
+        'template_version': PDF_TEMPLATE_VERSION,
+        'fonts': font_signature(),
+        'query': {field: query_data[field] for field in
+                  ('case_type', 'case_number', 'year', 'created_at', 'response_data')},
+    }
+    canonical = json.dumps(content, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+def cached_pdf_path(key, disk_cache=None):
+    """Path of the cached PDF for a cache key, or None if it is not on disk
+
+    A hit is marked as recently used for eviction.
+    """
+    if not (PDF_DISK_CACHE if disk_cache is None else disk_cache):
+        return None
+    pdf_path = os.path.join(PDF_CACHE_DIR, f"{key}.pdf")
+    try:
+        os.utime(pdf_path)
+    except FileNotFoundError:
+        return None
+    return pdf_path
+
+def case_pdf(query_data, disk_cache=None, key=None):
+    """PDF bytes and cache key for a saved query
+
+    Rendering happens in memory. With the disk cache on (PDF_DISK_CACHE by
+    default), PDFs are kept in PDF_CACHE_DIR under their content hash, so a
+    saved query always maps to the same file and a new PDF_TEMPLATE_VERSION
+    to a new one. key skips hashing the query again when the caller already
+    has its pdf_cache_key.
+    """
+    key = key or pdf_cache_key(query_data)
+    if not (PDF_DISK_CACHE if disk_cache is None else disk_cache):
+        return render_case_pdf(query_data), key
+    
+    pdf_path = cached_pdf_path(key, disk_cache=True)
+    if pdf_path:
+        try:
+            with open(pdf_path, 'rb') as f:
+                return f.read(), key
+        except FileNotFoundError:
+            pass  # evicted since the check
     
-    # Create static directory if it doesn't exist
-    os.makedirs('static', exist_ok=True)
+    pdf_path = os.path.join(PDF_CACHE_DIR, f"{key}.pdf")
+    data = render_case_pdf(query_data)
+    write_atomic(pdf_path, data)
+    evict_pdf_cache(keep=pdf_path)
+    return data, key
+
+def evict_pdf_cache(max_bytes=None, keep=None):
+    """Delete least recently used cached PDFs until the directory fits in max_bytes"""
+    max_bytes = MAX_PDF_CACHE_BYTES if max_bytes is None else max_bytes
+    stats = {}
+    try:
+        for entry in os.scandir(PDF_CACHE_DIR):
+            if entry.name.endswith('.pdf'):
+                try:
+                    stats[entry.path] = entry.stat()
+                except FileNotFoundError:
+                    pass  # evicted by another worker while scanning
+    except FileNotFoundError:
+        return 0
     
-    pdf.output(pdf_path)
-    return pdf_path
\ No newline at end of file
+    total = sum(stat.st_size for stat in stats.values())
+    removed = 0
+    for path in sorted(stats, key=lambda path: stats[path].st_mtime):
+        if total <= max_bytes:
+            break
+        if keep and os.path.abspath(path) == os.path.abspath(keep):
+            continue
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass  # already evicted by another worker
+        total -= stats[path].st_size
+        removed += 1
+    return removed
+
+class CauseListReport(FPDF):
+    """Cause list PDF that repeats the court heading and table header on every page"""
+
+    def __init__(self, title):
+        super().__init__()
+        self.title = title
+        self.group = None
+        self.group_rows = 0
+        self.alias_nb_pages()
+        self.set_auto_page_break(True, margin=15)
+        self.family = setup_fonts(self)
+
+    def header(self):
+        self.set_font(self.family, 'B', 14)
+        self.cell(0, 8, pdf_text(self, self.title), 0, 1, 'C')
+        self.ln(2)
+        if self.group:
+            self.group_heading(continued=self.group_rows > 0)
+
+    def footer(self):
+        self.set_y(-12)
+        self.set_font(self.family, '', 8)
+        self.cell(0, 6, f"Page {self.page_no()}/{{nb}}", 0, 0, 'C')
+
+    def group_heading(self, continued=False):
+        listing_date, court, bench = self.group
+        heading = ' - '.join(part for part in (court, bench, listing_date) if part)
+        self.set_font(self.family, 'B', 12)
+        self.cell(0, 8, pdf_text(self, heading + (' (continued)' if continued else '')), 0, 1)
+        self.set_font(self.family, 'B', 9)
+        self.set_fill_color(230, 230, 230)
+        for heading, _, width in REPORT_COLUMNS:
+            self.cell(width, 7, heading, 1, 0, 'L', True)
+        self.ln()
+        self.set_font(self.family, '', 9)
+
+    def start_group(self, group):
+        """Begin a court/bench section, on a new page if the heading would be orphaned"""
+        self.group = group
+        self.group_rows = 0
+        if self.page == 0 or self.get_y() + 30 > self.page_break_trigger:
+            self.add_page()
+        else:
+            self.ln(4)
+            self.group_heading()
+
+    def fit_text(self, text, width):
+        """text, clipped with '...' to fit width"""
+        if self.get_string_width(text) <= width:
+            return text
+        low, high = 0, len(text)
+        while low < high:  # longest prefix that still fits with the ellipsis
+            middle = (low + high + 1) // 2
+            if self.get_string_width(text[:middle] + '...') <= width:
+                low = middle
+            else:
+                high = middle - 1
+        return text[:low] + '...'
+
+    def add_row(self, listing):
+        self.group_rows += 1
+        for _, field, width in REPORT_COLUMNS:
+            value = self.group_rows if field is None else pdf_text(self, listing.get(field))
+            # One line per listing keeps row heights fixed; clip long party names
+            self.cell(width, 6, self.fit_text(str(value), width - 2), 1)
+        self.ln()
+
+def generate_pdf(start_date=None, end_date=None, filename='cause_list.pdf'):
+    """Cause list report for a range of listing dates (default tomorrow), grouped by court and bench
+
+    Listings are streamed from the cause list store in court/bench order and
+    laid out as they arrive, so no list of listings is held in memory.
+    """
+    ensure_cause_list_store()
+    start_date = str(start_date or (datetime.now() + timedelta(days=1)).date())
+    end_date = str(end_date or start_date)
+    title = f"Cause List {start_date}" if start_date == end_date else f"Cause List {start_date} to {end_date}"
+
+    pdf = CauseListReport(title)
+    total = 0
+    listings = iter_listings(start_date, end_date, order_by=REPORT_ORDER)
+    for group, rows in groupby(listings, key=lambda l: (l['listing_date'], l['court_type'], l['bench'])):
+        pdf.start_group(group)
+        for listing in rows:
+            pdf.add_row(listing)
+            total += 1
+
+    if not total:
+        pdf.group = None
+        pdf.add_page()
+        pdf.set_font(pdf.family, '', 11)
+        pdf.cell(0, 8, 'No listings found for these dates.', 0, 1)
+
+    write_atomic(filename, bytes(pdf.output()))
+    print(f"Cause list report with {total} listings on {pdf.page_no()} pages saved to {filename}")
+    return filename
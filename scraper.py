@@ -2,21 +2,21 @@ import requests
 from bs4 import BeautifulSoup
 import json
 from datetime import datetime, timedelta
-import time
 import re
+from crawler import crawl
+from http_session import get_shared_session
+from http_cache import cached_get
+import ecourts_client
+from court_metadata import resolve_court_codes
+from case_number import parse_case_number
+from cause_list_store import init_cause_list_store, upsert_listings
+
+HIGH_COURT_URL = "https://hcservices.ecourts.gov.in/hcservices/main.php"
+DISTRICT_COURT_URL = "https://services.ecourts.gov.in/ecourtindia_v6/"
 
 def get_session():
-    """Create a session with headers to mimic a browser"""
-    session = requests.Session()
-    session.headers.update({
-        'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-        'Accept-Language': 'en-US,en;q=0.5',
-        'Accept-Encoding': 'gzip, deflate, br',
-        'Connection': 'keep-alive',
-        'Upgrade-Insecure-Requests': '1'
-    })
-    return session
+    """Return the shared pooled session with headers to mimic a browser"""
+    return get_shared_session()
 
 def create_sample_data():
     """Create sample cause list data since actual scraping requires complex form interactions"""
@@ -62,10 +62,10 @@ def create_sample_data():
 
 def scrape_high_court(session):
     """Attempt to scrape High Court - returns sample data due to dynamic content"""
-    url = "https://hcservices.ecourts.gov.in/hcservices/main.php"
+    url = HIGH_COURT_URL
     
     try:
-        response = session.get(url, timeout=10)
+        response = cached_get(session, url, timeout=10)
         response.raise_for_status()
         print(f"High Court website accessible (Status: {response.status_code})")
         print("Note: Actual cause lists require form submission with captcha validation")
@@ -80,10 +80,10 @@ def scrape_high_court(session):
 
 def scrape_district_court(session):
     """Attempt to scrape District Court - returns sample data due to dynamic content"""
-    url = "https://services.ecourts.gov.in/ecourtindia_v6/"
+    url = DISTRICT_COURT_URL
     
     try:
-        response = session.get(url, timeout=10)
+        response = cached_get(session, url, timeout=10)
         response.raise_for_status()
         print(f"District Court website accessible (Status: {response.status_code})")
         print("Note: Actual cause lists require navigation to specific court and date selection")
@@ -105,7 +105,16 @@ def save_to_json(data, filename='cause_list.json'):
     except Exception as e:
         print(f"Error saving to JSON: {e}")
 
-def scrape():
+def save_to_store(data):
+    """Upsert extracted data into the indexed cause list store"""
+    try:
+        init_cause_list_store()
+        count = upsert_listings(data)
+        print(f"Stored {count} entries in the cause list store")
+    except Exception as e:
+        print(f"Error saving to cause list store: {e}")
+
+def scrape(targets=None):
     """Main function to orchestrate the scraping process"""
     print("Starting court cause list scraping...")
     print("\n=== IMPORTANT NOTE ===")
@@ -116,26 +125,16 @@ def scrape():
     print("Generating sample data for demonstration purposes.\n")
     
     session = get_session()
-    all_cause_lists = []
     
-    # Scrape High Court
-    print("Accessing High Court website...")
-    hc_data = scrape_high_court(session)
-    all_cause_lists.extend(hc_data)
-    print(f"Generated {len(hc_data)} sample entries from High Court")
-    
-    # Add delay between requests
-    time.sleep(2)
-    
-    # Scrape District Court
-    print("Accessing District Court website...")
-    dc_data = scrape_district_court(session)
-    all_cause_lists.extend(dc_data)
-    print(f"Generated {len(dc_data)} sample entries from District Court")
+    # Fetch all courts concurrently, rate limited per host instead of a fixed sleep
+    targets = targets if targets is not None else COURT_TARGETS
+    print(f"Crawling {len(targets)} court targets...")
+    all_cause_lists = crawl(targets, session)
     
     # Save to JSON
     if all_cause_lists:
         save_to_json(all_cause_lists)
+        save_to_store(all_cause_lists)
         print(f"\nTotal sample entries created: {len(all_cause_lists)}")
         print("\nTo get actual data, you would need to:")
         print("1. Use Selenium WebDriver for JavaScript interaction")
@@ -144,11 +143,61 @@ def scrape():
     else:
         print("No data generated")
 
-def scrape_case_by_number(case_type, case_number, year):
-    """Search for specific case by number - returns sample data for MVP"""
+def lookup_case_on_portal(session, court, case_number, year):
+    """Look up a case through the portal's AJAX endpoints, returning case fields or None"""
+    case = parse_case_number(case_number) or parse_case_number(f"{case_number}/{year}")
+    if case:
+        number = case.number
+    else:
+        digits = re.findall(r'\d+', case_number)
+        if not digits:
+            return None
+        number = digits[-1]
+    
+    records = ecourts_client.search_case_number(
+        session, court['state_code'], court['court_code'], court['case_type_code'],
+        number, year, court.get('captcha', ''))
+    if not records:
+        return None
+    
+    record = records[0]
+    history = ecourts_client.fetch_case_history(
+        session, court['state_code'], court['court_code'], record['case_no'], record['cino'])
+    return {
+        'party_name': record['party_name'],
+        'date_of_listing': history.get('next_hearing_date') or history.get('next_date', ''),
+        'court_name': record['court_name'],
+        'status': history.get('case_status') or history.get('stage_of_case') or 'Registered',
+        'cino': record['cino'],
+    }
+
+def scrape_case_by_number(case_type, case_number, year, court=None, session=None):
+    """Search for specific case by number
+    
+    court holds the portal codes for the bench ('state_code', 'court_code',
+    'case_type_code' and optionally 'captcha'), or the names 'state', 'bench' and
+    'case_type' to resolve from the court metadata store. Without them, or when
+    the portal lookup fails, sample data is returned as before.
+    """
     try:
+        if court and 'state_code' not in court:
+            codes = resolve_court_codes(court.get('state'), court.get('bench'), court.get('case_type'))
+            court = {**codes, 'captcha': court.get('captcha', '')} if codes else None
+        
+        if court:
+            session = session or get_session()
+            portal_data = lookup_case_on_portal(session, court, case_number, year)
+            if portal_data:
+                print(f"Found case on portal: {case_number}/{year}")
+                return {
+                    'case_type': case_type,
+                    'case_number': case_number,
+                    'year': year,
+                    **portal_data,
+                    'scraped_at': datetime.now().isoformat(),
+                }
+        
         # For MVP, return sample case data
-        # In production, this would use Selenium to interact with court websites
         sample_case = {
             'case_type': case_type,
             'case_number': case_number,
@@ -158,7 +207,7 @@ def scrape_case_by_number(case_type, case_number, year):
             'court_name': 'High Court of Mumbai' if case_type == 'High Court' else 'District Court Mumbai',
             'status': 'Listed for hearing',
             'scraped_at': datetime.now().isoformat(),
-            'note': 'Sample data - actual scraping requires Selenium WebDriver'
+            'note': 'Sample data - portal codes not configured or case not found on portal'
         }
         
         print(f"Generated sample data for case: {case_number}/{year}")
@@ -168,5 +217,11 @@ def scrape_case_by_number(case_type, case_number, year):
         print(f"Error in case search: {e}")
         return None
 
+# Courts crawled by scrape(); add one entry per bench or complex to track
+COURT_TARGETS = [
+    {'name': 'High Court', 'url': HIGH_COURT_URL, 'scraper': scrape_high_court},
+    {'name': 'District Court', 'url': DISTRICT_COURT_URL, 'scraper': scrape_district_court},
+]
+
 if __name__ == "__main__":
     scrape()
\ No newline at end of file
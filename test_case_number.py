@@ -0,0 +1,60 @@
+import pytest
+from case_number import parse_case_number, normalize_case_number, CaseNumber
+
+@pytest.mark.parametrize('text, expected', [
+    ('WP/12345/2024', ('WP', '12345', '2024')),
+    ('WP-12345-2024', ('WP', '12345', '2024')),
+    ('wp/1/2024', ('WP', '1', '2024')),
+    ('WP 123 of 2024', ('WP', '123', '2024')),
+    ('W.P.(C) 1234/2024', ('WP(C)', '1234', '2024')),
+    ('W.P.(C) No. 0123 of 2024', ('WP(C)', '123', '2024')),
+    ('CRL.A. No. 45 of 2023', ('CRLA', '45', '2023')),
+    ('Crl. A. No. 45 of 2023', ('CRLA', '45', '2023')),
+    ('CRL.M.C. 55/2022', ('CRLMC', '55', '2022')),
+    ('MA-ST/5/2021', ('MA-ST', '5', '2021')),
+    ('CS(OS) 12/2020', ('CS(OS)', '12', '2020')),
+    # No. joined straight onto the type
+    ('W.P.No.123/2024', ('WP', '123', '2024')),
+    ('C.C.No.111/2024', ('CC', '111', '2024')),
+    ('O.S.No.45/2019', ('OS', '45', '2019')),
+    ('Crl.A.No.45/2023', ('CRLA', '45', '2023')),
+    ('W.P.(C)No.123/2024', ('WP(C)', '123', '2024')),
+    # Inside a cause list row
+    ('1. WP 5/2024 Ram Kumar vs State', ('WP', '5', '2024')),
+])
+def test_parse_case_number(text, expected):
+    assert parse_case_number(text) == CaseNumber(*expected)
+
+@pytest.mark.parametrize('text', [
+    'Page 1 of 2024',
+    'Item 3 of 2024',
+    'Court No. 5 of 2024',
+    '12345/2024',
+    'Ram Kumar vs. State',
+    '',
+    None,
+])
+def test_parse_case_number_rejects_noise(text):
+    assert parse_case_number(text) is None
+
+@pytest.mark.parametrize('text', [
+    'WP/123/2024',
+    'W.P.No.123/2024',
+    'W.P. No. 123 of 2024',
+    'wp-0123-2024',
+])
+def test_normalize_case_number_styles_agree(text):
+    assert normalize_case_number(text) == 'WP/123/2024'
+
+@pytest.mark.parametrize('text, expected', [
+    # Only a case number at the start of the cell counts; otherwise the whole
+    # cell text is the key, so these do not collapse onto their last word
+    ('CM APPL. 123/2024', 'CM APPL. 123/2024'),
+    ('CRL APPL 123/2024', 'CRL APPL 123/2024'),
+    ('Criminal Appeal No. 45 of 2023', 'CRIMINAL APPEAL NO. 45 OF 2023'),
+    ('Ram Kumar 5/2024', 'RAM KUMAR 5/2024'),
+    ('Hearing on 5/2024', 'HEARING ON 5/2024'),
+    ('  WP  123/2024 ', 'WP/123/2024'),
+])
+def test_normalize_case_number_reads_only_the_start(text, expected):
+    assert normalize_case_number(text) == expected
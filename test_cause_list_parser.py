@@ -0,0 +1,53 @@
+import pytest
+
+bs4 = pytest.importorskip('bs4')
+from cause_list_parser import iter_table_rows, CELL_TAGS
+
+DOCUMENTS = {
+    'plain': '''
+        <table><tr><th>Sr</th><th>Case</th></tr>
+        <tr><td>1</td><td>WP/1/2024 <b>Ram</b> vs State</td></tr></table>
+    ''',
+    'nested tables': '''
+        <table><tr><td>Bench 1<table><tr><td>WP/1/2024</td><td><span>Ram</span></td></tr>
+        <tr><td>WP/2/2024</td></tr></table></td><td>after</td></tr></table>
+    ''',
+    'unclosed td and tr': '''
+        <table><tr><td>WP/1/2024<td>Ram Kumar
+        <tr><td>WP/2/2024<td>Sita</table><p>outside</p>
+    ''',
+    'comments and scripts': '''
+        <table><tr><td>WP/<!-- hidden -->1/2024</td>
+        <td><script>var x = "<td>not a cell</td>";</script>Ram</td>
+        <td><style>td { color: red }</style>Kumar</td></tr></table>
+    ''',
+    'entities and multibyte text': '''
+        <table><tr><td>Ram &amp; Sons</td><td>राम कुमार</td><td>&#8377; 100</td></tr></table>
+    ''',
+    'rows outside tables': '''
+        <tr><td>no table</td></tr><table><tr><td>WP/1/2024</td></tr></table>
+    ''',
+}
+
+def soup_rows(html):
+    """Rows the way the BeautifulSoup scrapers read them, in document order"""
+    soup = bs4.BeautifulSoup(html, 'html.parser')
+    return [[cell.get_text(strip=True) for cell in tr.find_all(list(CELL_TAGS))]
+            for tr in soup.find_all('tr') if tr.find_parent('table')]
+
+def chunked(html, size):
+    data = html.encode('utf-8')
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+@pytest.mark.parametrize('size', [1, 7, 64 * 1024])
+@pytest.mark.parametrize('name', sorted(DOCUMENTS))
+def test_tokenizer_matches_beautifulsoup(name, size):
+    html = DOCUMENTS[name]
+    rows = list(iter_table_rows(chunked(html, size)))
+    # Rows come out as they close, so only the order of nested rows can differ
+    assert sorted(rows) == sorted(soup_rows(html))
+
+def test_nested_rows_come_out_in_close_order():
+    rows = list(iter_table_rows([DOCUMENTS['nested tables']]))
+    outer, first, second = soup_rows(DOCUMENTS['nested tables'])
+    assert rows == [first, second, outer]
@@ -0,0 +1,52 @@
+import pytest
+
+fpdf = pytest.importorskip('fpdf')
+import pdf_fonts
+
+@pytest.fixture
+def regular_font():
+    fonts = pdf_fonts.get_font_set()
+    if not fonts:
+        pytest.skip('no TTF font installed')
+    return fonts[0]
+
+def subset_chars(font):
+    """Characters fpdf2 put in a font's subset (reads SubsetMap internals, like install_font)"""
+    return {char for glyph in font.subset._char_id_per_glyph for char in glyph.unicode}
+
+def render(text, path):
+    pdf = fpdf.FPDF()
+    pdf.add_page()
+    pdf_fonts.install_font(pdf, pdf_fonts.FONT_FAMILY, '', path)
+    pdf.set_font(pdf_fonts.FONT_FAMILY, size=12)
+    pdf.cell(0, 10, text)
+    return pdf, bytes(pdf.output())
+
+def test_pinned_fpdf_uses_cached_install():
+    # Bump TESTED_FPDF_VERSIONS only after these tests pass on the new release
+    assert pdf_fonts.CACHED_FONT_INSTALL == (fpdf.FPDF_VERSION in pdf_fonts.TESTED_FPDF_VERSIONS)
+
+def test_cached_install_measures_like_add_font(regular_font):
+    cached = fpdf.FPDF()
+    pdf_fonts.install_font(cached, 'cached', '', regular_font)
+    cached.set_font('cached', size=12)
+    plain = fpdf.FPDF()
+    plain.add_font('plain', '', regular_font)
+    plain.set_font('plain', size=12)
+    for text in ('W.P.(C) No. 123 of 2024', 'Ram Kumar vs State of Maharashtra'):
+        assert cached.get_string_width(text) == pytest.approx(plain.get_string_width(text))
+
+@pytest.mark.parametrize('cached_install', [True, False])
+def test_documents_get_their_own_subset(regular_font, monkeypatch, cached_install):
+    monkeypatch.setattr(pdf_fonts, 'CACHED_FONT_INSTALL', cached_install)
+    first, first_data = render('abc', regular_font)
+    second, second_data = render('xyz', regular_font)
+    first_font = first.fonts[pdf_fonts.FONT_FAMILY]
+    second_font = second.fonts[pdf_fonts.FONT_FAMILY]
+    assert first_font.subset is not second_font.subset
+    assert first_font.ttfont is not second_font.ttfont
+    assert first_font.desc is not second_font.desc
+    assert first_data.startswith(b'%PDF') and second_data.startswith(b'%PDF')
+    assert {ord('a'), ord('b'), ord('c')} <= subset_chars(first_font)
+    assert ord('x') not in subset_chars(first_font)
+    assert ord('a') not in subset_chars(second_font)